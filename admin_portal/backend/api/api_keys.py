@@ -1,13 +1,18 @@
 """API Keys management routes."""
+import base64
+import json
 import sys
+from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 
-from app.db.dynamodb import DynamoDBClient, APIKeyManager, UsageTracker, UsageStatsManager
+from app.db.dynamodb import APIKeyManager, UsageTracker, UsageStatsManager, get_dynamodb_client
 from admin_portal.backend.schemas.api_key import (
     ApiKeyCreate,
     ApiKeyUpdate,
@@ -20,15 +25,52 @@ router = APIRouter()
 
 def get_managers():
     """Get DynamoDB managers."""
-    db_client = DynamoDBClient()
+    db_client = get_dynamodb_client()
     return APIKeyManager(db_client), UsageTracker(db_client), UsageStatsManager(db_client)
 
 
+def _encode_cursor(last_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Encode a DynamoDB LastEvaluatedKey as an opaque URL-safe cursor."""
+    if not last_key:
+        return None
+    raw = json.dumps(last_key, default=lambda v: int(v) if isinstance(v, Decimal) else str(v))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+# Key shapes of the listing's LastEvaluatedKey: EntityTypeIndex query, or
+# the Scan fallback on tables without the index
+_INDEX_CURSOR_KEYS = {"api_key", "entity_type", "created_at"}
+_SCAN_CURSOR_KEYS = {"api_key"}
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode a cursor produced by _encode_cursor back into an ExclusiveStartKey."""
+    if not cursor:
+        return None
+    try:
+        last_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        last_key = None
+    if (
+        isinstance(last_key, dict)
+        and set(last_key) in (_INDEX_CURSOR_KEYS, _SCAN_CURSOR_KEYS)
+        and isinstance(last_key["api_key"], str)
+        and isinstance(last_key.get("entity_type", ""), str)
+        and type(last_key.get("created_at", 0)) is int
+    ):
+        return last_key
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor",
+    )
+
+
 @router.get("", response_model=ApiKeyListResponse)
-async def list_api_keys(
+def list_api_keys(
     limit: int = Query(default=20, ge=1, le=100),
     status_filter: Optional[str] = Query(default=None, alias="status"),
     search: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
 ):
     """
     List all API keys with pagination and filtering.
@@ -37,13 +79,18 @@ async def list_api_keys(
         limit: Maximum number of items to return (1-100)
         status_filter: Filter by status ('active', 'revoked', or None for all)
         search: Search term for filtering by name or key prefix
+        cursor: Opaque cursor from a previous response's next_cursor
     """
     api_key_manager, _, usage_stats_manager = get_managers()
 
-    result = api_key_manager.list_all_api_keys(
-        limit=limit,
-        status_filter=status_filter,
-    )
+    try:
+        result = api_key_manager.list_all_api_keys(
+            limit=limit,
+            status_filter=status_filter,
+            last_key=_decode_cursor(cursor),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     items = result.get("items", [])
 
@@ -76,15 +123,20 @@ async def list_api_keys(
             item["total_cache_write_1h_tokens"] = 0
             item["total_requests"] = 0
 
-    return ApiKeyListResponse(
-        items=[ApiKeyResponse(**item) for item in items],
-        count=len(items),
-        last_key=result.get("last_key"),
+    # Each row is validated once here; returning a Response then skips
+    # FastAPI's second validation pass of the same rows
+    rows = [ApiKeyResponse.model_validate(item) for item in items if "api_key" in item]
+    response = ApiKeyListResponse(
+        items=rows,
+        count=len(rows),
+        last_key=jsonable_encoder(result.get("last_key")),
+        next_cursor=_encode_cursor(result.get("last_key")),
     )
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
 
 @router.get("/{api_key}", response_model=ApiKeyResponse)
-async def get_api_key(api_key: str):
+def get_api_key(api_key: str):
     """
     Get details of a specific API key.
 
@@ -104,7 +156,7 @@ async def get_api_key(api_key: str):
 
 
 @router.post("", response_model=ApiKeyResponse, status_code=status.HTTP_201_CREATED)
-async def create_api_key(request: ApiKeyCreate):
+def create_api_key(request: ApiKeyCreate):
     """
     Create a new API key.
 
@@ -130,7 +182,7 @@ async def create_api_key(request: ApiKeyCreate):
 
 
 @router.put("/{api_key}", response_model=ApiKeyResponse)
-async def update_api_key(api_key: str, request: ApiKeyUpdate):
+def update_api_key(api_key: str, request: ApiKeyUpdate):
     """
     Update an existing API key.
 
@@ -187,7 +239,7 @@ async def update_api_key(api_key: str, request: ApiKeyUpdate):
 
 
 @router.delete("/{api_key}")
-async def deactivate_api_key(api_key: str):
+def deactivate_api_key(api_key: str):
     """
     Deactivate (revoke) an API key.
 
@@ -209,7 +261,7 @@ async def deactivate_api_key(api_key: str):
 
 
 @router.post("/{api_key}/reactivate")
-async def reactivate_api_key(api_key: str):
+def reactivate_api_key(api_key: str):
     """
     Reactivate a revoked API key.
 
@@ -237,7 +289,7 @@ async def reactivate_api_key(api_key: str):
 
 
 @router.delete("/{api_key}/permanent")
-async def delete_api_key_permanently(api_key: str):
+def delete_api_key_permanently(api_key: str):
     """
     Permanently delete an API key.
 
@@ -267,7 +319,7 @@ async def delete_api_key_permanently(api_key: str):
 
 
 @router.get("/{api_key}/usage")
-async def get_api_key_usage(api_key: str):
+def get_api_key_usage(api_key: str):
     """
     Get usage statistics for an API key.
 
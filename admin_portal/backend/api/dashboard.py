@@ -1,14 +1,15 @@
 """Dashboard API routes."""
+import asyncio
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Union
+from datetime import datetime, timedelta, timezone
+from typing import List, Union
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
-from app.db.dynamodb import DynamoDBClient, APIKeyManager, ModelPricingManager, UsageTracker, ModelMappingManager, UsageStatsManager
+from app.db.dynamodb import get_dynamodb_client, APIKeyManager, ModelPricingManager, UsageTracker, ModelMappingManager, UsageStatsManager, UsageRollupManager
 from app.core.config import settings
 from admin_portal.backend.schemas.dashboard import DashboardStats
 
@@ -69,23 +70,71 @@ def _resolve_model_id(
     return model_id
 
 
+def _load_custom_mappings(model_mapping_manager: ModelMappingManager) -> List[dict]:
+    """Load custom model mappings, tolerating errors."""
+    try:
+        return model_mapping_manager.list_mappings()
+    except Exception as e:
+        print(f"[Dashboard] Error loading model mappings: {e}")
+        return []
+
+
+def _sum_usage_stats(usage_stats_manager: UsageStatsManager, all_keys: List[dict]) -> dict:
+    """Sum the aggregated usage stats of all given API keys."""
+    totals = {
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_cached_tokens": 0,
+        "total_cache_write_5m_tokens": 0,
+        "total_cache_write_1h_tokens": 0,
+        "total_requests": 0,
+    }
+    for key in all_keys:
+        api_key = key.get("api_key")
+        if api_key:
+            stats = usage_stats_manager.get_stats(api_key)
+            if stats:
+                for field in totals:
+                    totals[field] += int(stats.get(field, 0) or 0)
+    return totals
+
+
+def _day_buckets(start: datetime, end: datetime) -> List[str]:
+    """Return the UTC day buckets (YYYY-MM-DD) covering [start, end]."""
+    days = []
+    day = start.date()
+    while day <= end.date():
+        days.append(day.strftime("%Y-%m-%d"))
+        day += timedelta(days=1)
+    return days
+
+
 @router.get("/stats", response_model=DashboardStats)
-async def get_dashboard_stats():
+async def get_dashboard_stats(
+    days: int = Query(default=30, ge=1, le=365),
+):
     """
     Get dashboard statistics.
 
     Returns overview stats including total budget, active keys,
-    and system status.
+    and system status. Models without pricing are looked up in the
+    usage of the last `days` days.
     """
     # Initialize DynamoDB clients
-    db_client = DynamoDBClient()
+    db_client = await asyncio.to_thread(get_dynamodb_client)
     api_key_manager = APIKeyManager(db_client)
     pricing_manager = ModelPricingManager(db_client)
     usage_tracker = UsageTracker(db_client)
+    rollup_manager = UsageRollupManager(db_client)
+    usage_stats_manager = UsageStatsManager(db_client)
+    model_mapping_manager = ModelMappingManager(db_client)
 
-    # Get all API keys
-    all_keys_result = api_key_manager.list_all_api_keys(limit=1000)
-    all_keys = all_keys_result.get("items", [])
+    # boto3 is blocking: run the independent reads in worker threads, together
+    all_keys, pricing_result, custom_mappings = await asyncio.gather(
+        asyncio.to_thread(api_key_manager.scan_all_api_keys),
+        asyncio.to_thread(pricing_manager.list_all_pricing, full=True),
+        asyncio.to_thread(_load_custom_mappings, model_mapping_manager),
+    )
 
     # Calculate stats
     total_api_keys = len(all_keys)
@@ -101,67 +150,61 @@ async def get_dashboard_stats():
     new_keys_this_week = sum(1 for k in all_keys if _parse_timestamp(k.get("created_at")) > week_ago)
 
     # Get model pricing stats
-    pricing_result = pricing_manager.list_all_pricing(limit=1000)
     all_pricing = pricing_result.get("items", [])
     total_models = len(all_pricing)
     active_models = sum(1 for p in all_pricing if p.get("status") == "active")
 
     # Calculate total token usage across all API keys
-    usage_stats_manager = UsageStatsManager(db_client)
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_cached_tokens = 0
-    total_cache_write_5m_tokens = 0
-    total_cache_write_1h_tokens = 0
-    total_requests = 0
-
-    for key in all_keys:
-        api_key = key.get("api_key")
-        if api_key:
-            stats = usage_stats_manager.get_stats(api_key)
-            if stats:
-                total_input_tokens += int(stats.get("total_input_tokens", 0) or 0)
-                total_output_tokens += int(stats.get("total_output_tokens", 0) or 0)
-                total_cached_tokens += int(stats.get("total_cached_tokens", 0) or 0)
-                total_cache_write_5m_tokens += int(stats.get("total_cache_write_5m_tokens", 0) or 0)
-                total_cache_write_1h_tokens += int(stats.get("total_cache_write_1h_tokens", 0) or 0)
-                total_requests += int(stats.get("total_requests", 0) or 0)
+    usage_totals = await asyncio.to_thread(_sum_usage_stats, usage_stats_manager, all_keys)
 
     # Get set of models that have pricing configured (Bedrock model IDs)
     priced_models = {p.get("model_id") for p in all_pricing if p.get("model_id")}
 
     # Build model mapping cache from DynamoDB custom mappings
     model_mapping_cache: dict[str, str] = {}
-    try:
-        model_mapping_manager = ModelMappingManager(db_client)
-        custom_mappings = model_mapping_manager.list_mappings()
-        for mapping in custom_mappings:
-            anthropic_id = mapping.get("anthropic_model_id", "")
-            bedrock_id = mapping.get("bedrock_model_id", "")
-            if anthropic_id and bedrock_id:
-                model_mapping_cache[anthropic_id] = bedrock_id
-    except Exception as e:
-        print(f"[Dashboard] Error loading model mappings: {e}")
+    for mapping in custom_mappings:
+        anthropic_id = mapping.get("anthropic_model_id", "")
+        bedrock_id = mapping.get("bedrock_model_id", "")
+        if anthropic_id and bedrock_id:
+            model_mapping_cache[anthropic_id] = bedrock_id
 
     # Get distinct models from usage table and find those without pricing
     models_without_pricing = []
     try:
         used_models = set()
-        # Scan usage table to get distinct models (with pagination)
-        usage_table = usage_tracker.table
-        last_key = None
-        while True:
-            scan_kwargs = {"ProjectionExpression": "model", "Limit": 1000}
-            if last_key:
-                scan_kwargs["ExclusiveStartKey"] = last_key
-            response = usage_table.scan(**scan_kwargs)
-            for item in response.get("Items", []):
+        # Query the daily usage index for each day in the window
+        window_end = datetime.now(timezone.utc)
+        window_start = window_end - timedelta(days=days)
+        start_ms = int(window_start.timestamp() * 1000)
+        end_ms = int(window_end.timestamp() * 1000)
+        # Closed days come from the precomputed rollups in one BatchGetItem.
+        # Today, and any day the aggregator has not rolled up yet, is read
+        # live from the daily usage index.
+        window_days = _day_buckets(window_start, window_end)
+        today = window_end.strftime("%Y-%m-%d")
+        try:
+            rollups = await asyncio.to_thread(
+                rollup_manager.get_days, UsageRollupManager.ALL_SCOPE, window_days
+            )
+        except Exception as e:
+            print(f"[Dashboard] Error loading usage rollups: {e}")
+            rollups = {}
+        for day, rollup in rollups.items():
+            if day != today:
+                used_models.update(rollup.get("models", ()))
+        live_days = [d for d in window_days if d == today or d not in rollups]
+
+        # Each day is an independent Query; issue them concurrently so the
+        # window costs about one round trip instead of one per day.
+        day_results = await asyncio.gather(*(
+            asyncio.to_thread(usage_tracker.query_day, day, start_ms, end_ms, "model")
+            for day in live_days
+        ))
+        for items in day_results:
+            for item in items:
                 model = item.get("model")
                 if model:
                     used_models.add(model)
-            last_key = response.get("LastEvaluatedKey")
-            if not last_key:
-                break
 
         # Find models that have usage but no pricing
         for model in used_models:
@@ -182,10 +225,5 @@ async def get_dashboard_stats():
         system_status="operational",
         new_keys_this_week=new_keys_this_week,
         models_without_pricing=models_without_pricing,
-        total_input_tokens=total_input_tokens,
-        total_output_tokens=total_output_tokens,
-        total_cached_tokens=total_cached_tokens,
-        total_cache_write_5m_tokens=total_cache_write_5m_tokens,
-        total_cache_write_1h_tokens=total_cache_write_1h_tokens,
-        total_requests=total_requests,
+        **usage_totals,
     )
@@ -8,7 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from fastapi import APIRouter, HTTPException, Query, status
 
-from app.db.dynamodb import DynamoDBClient, ModelMappingManager
+from app.db.dynamodb import ModelMappingManager, get_dynamodb_client
 from app.core.config import settings
 from admin_portal.backend.schemas.model_mapping import (
     ModelMappingCreate,
@@ -22,12 +22,12 @@ router = APIRouter()
 
 def get_manager():
     """Get ModelMappingManager instance."""
-    db_client = DynamoDBClient()
+    db_client = get_dynamodb_client()
     return ModelMappingManager(db_client)
 
 
 @router.get("", response_model=ModelMappingListResponse)
-async def list_model_mappings(
+def list_model_mappings(
     search: Optional[str] = Query(default=None),
 ):
     """
@@ -80,7 +80,7 @@ async def list_model_mappings(
 
 
 @router.get("/{anthropic_model_id:path}", response_model=ModelMappingResponse)
-async def get_model_mapping(anthropic_model_id: str):
+def get_model_mapping(anthropic_model_id: str):
     """
     Get a specific model mapping.
     """
@@ -117,7 +117,7 @@ async def get_model_mapping(anthropic_model_id: str):
 
 
 @router.post("", response_model=ModelMappingResponse, status_code=status.HTTP_201_CREATED)
-async def create_model_mapping(request: ModelMappingCreate):
+def create_model_mapping(request: ModelMappingCreate):
     """
     Create a new custom model mapping.
 
@@ -125,17 +125,15 @@ async def create_model_mapping(request: ModelMappingCreate):
     """
     mapping_manager = get_manager()
 
-    # Check if custom mapping already exists
-    existing = mapping_manager.get_mapping(request.anthropic_model_id)
-    if existing:
+    # Create the mapping; the conditional write rejects existing ones
+    if not mapping_manager.set_mapping(
+        request.anthropic_model_id, request.bedrock_model_id, must_exist=False
+    ):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Custom mapping for this model already exists. Use PUT to update.",
         )
 
-    # Create the mapping
-    mapping_manager.set_mapping(request.anthropic_model_id, request.bedrock_model_id)
-
     # Get the created item
     mappings = mapping_manager.list_mappings()
     for m in mappings:
@@ -156,7 +154,7 @@ async def create_model_mapping(request: ModelMappingCreate):
 
 
 @router.put("/{anthropic_model_id:path}", response_model=ModelMappingResponse)
-async def update_model_mapping(anthropic_model_id: str, request: ModelMappingUpdate):
+def update_model_mapping(anthropic_model_id: str, request: ModelMappingUpdate):
     """
     Update an existing custom model mapping.
 
@@ -165,9 +163,10 @@ async def update_model_mapping(anthropic_model_id: str, request: ModelMappingUpd
     anthropic_model_id = unquote(anthropic_model_id)
     mapping_manager = get_manager()
 
-    # Check if custom mapping exists
-    existing = mapping_manager.get_mapping(anthropic_model_id)
-    if not existing:
+    # Update the mapping; the conditional write fails if it does not exist
+    if not mapping_manager.set_mapping(
+        anthropic_model_id, request.bedrock_model_id, must_exist=True
+    ):
         # Check if it's a default mapping
         if anthropic_model_id in settings.default_model_mapping:
             raise HTTPException(
@@ -179,9 +178,6 @@ async def update_model_mapping(anthropic_model_id: str, request: ModelMappingUpd
             detail="Custom mapping not found",
         )
 
-    # Update the mapping
-    mapping_manager.set_mapping(anthropic_model_id, request.bedrock_model_id)
-
     # Get updated item
     mappings = mapping_manager.list_mappings()
     for m in mappings:
@@ -202,7 +198,7 @@ async def update_model_mapping(anthropic_model_id: str, request: ModelMappingUpd
 
 
 @router.delete("/{anthropic_model_id:path}")
-async def delete_model_mapping(anthropic_model_id: str):
+def delete_model_mapping(anthropic_model_id: str):
     """
     Delete a custom model mapping.
 
@@ -7,7 +7,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from fastapi import APIRouter, HTTPException, Query, status
 
-from app.db.dynamodb import DynamoDBClient, ModelPricingManager
+from app.db.dynamodb import ModelPricingManager, get_dynamodb_client
 from admin_portal.backend.schemas.pricing import (
     PricingCreate,
     PricingUpdate,
@@ -20,12 +20,12 @@ router = APIRouter()
 
 def get_manager():
     """Get ModelPricingManager instance."""
-    db_client = DynamoDBClient()
+    db_client = get_dynamodb_client()
     return ModelPricingManager(db_client)
 
 
 @router.get("", response_model=PricingListResponse)
-async def list_pricing(
+def list_pricing(
     limit: int = Query(default=50, ge=1, le=100),
     provider: Optional[str] = Query(default=None),
     status_filter: Optional[str] = Query(default=None, alias="status"),
@@ -67,13 +67,13 @@ async def list_pricing(
 
 
 @router.get("/providers")
-async def list_providers():
+def list_providers():
     """
     Get list of unique providers.
     """
     pricing_manager = get_manager()
 
-    result = pricing_manager.list_all_pricing(limit=1000)
+    result = pricing_manager.list_all_pricing(full=True)
     items = result.get("items", [])
 
     providers = list(set(item.get("provider", "Unknown") for item in items))
@@ -83,7 +83,7 @@ async def list_providers():
 
 
 @router.get("/{model_id:path}", response_model=PricingResponse)
-async def get_pricing(model_id: str):
+def get_pricing(model_id: str):
     """
     Get pricing for a specific model.
 
@@ -103,7 +103,7 @@ async def get_pricing(model_id: str):
 
 
 @router.post("", response_model=PricingResponse, status_code=status.HTTP_201_CREATED)
-async def create_pricing(request: PricingCreate):
+def create_pricing(request: PricingCreate):
     """
     Create new model pricing.
 
@@ -136,7 +136,7 @@ async def create_pricing(request: PricingCreate):
 
 
 @router.put("/{model_id:path}", response_model=PricingResponse)
-async def update_pricing(model_id: str, request: PricingUpdate):
+def update_pricing(model_id: str, request: PricingUpdate):
     """
     Update model pricing.
 
@@ -170,7 +170,7 @@ async def update_pricing(model_id: str, request: PricingUpdate):
 
 
 @router.delete("/{model_id:path}")
-async def delete_pricing(model_id: str):
+def delete_pricing(model_id: str):
     """
     Delete model pricing.
 
@@ -5,6 +5,7 @@ Independent FastAPI server for the admin portal running on port 8005.
 Serves both the API and the static frontend files.
 """
 import os
+import re
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -29,11 +30,15 @@ if env_path.exists():
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from admin_portal.backend.api import auth, api_keys, pricing, dashboard, model_mapping
-from admin_portal.backend.middleware.cognito_auth import CognitoAuthMiddleware
+from admin_portal.backend.middleware.cognito_auth import (
+    CognitoAuthMiddleware,
+    start_jwks_refresh,
+    stop_jwks_refresh,
+)
 from admin_portal.backend.services.usage_aggregator import start_aggregator, stop_aggregator
 
 # Configuration
@@ -45,6 +50,25 @@ USAGE_AGGREGATION_INTERVAL = 300  # 5 minutes
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend" / "dist"
 SERVE_STATIC = os.environ.get("SERVE_STATIC_FILES", "true").lower() == "true"
 
+# Vite emits content-hashed asset names (e.g. index-B2x9kQ_a.js), which never
+# change content and can be cached for a year. index.html must always be
+# revalidated so new builds are picked up.
+HASHED_ASSET_RE = re.compile(r"[-.][A-Za-z0-9_-]{8,}\.(?:js|css|png|svg|woff2?)$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+NO_CACHE_CONTROL = "no-cache"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks content-hashed assets as immutable."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if HASHED_ASSET_RE.search(str(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = NO_CACHE_CONTROL
+        return response
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -56,9 +80,13 @@ async def lifespan(app: FastAPI):
     # Start usage aggregator background task
     start_aggregator(interval_seconds=USAGE_AGGREGATION_INTERVAL)
 
+    # Prefetch Cognito signing keys and refresh them hourly
+    start_jwks_refresh()
+
     yield
 
-    # Stop usage aggregator
+    # Stop background tasks
+    stop_jwks_refresh()
     stop_aggregator()
     print("Admin Portal shutting down...")
 
@@ -70,6 +98,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -102,7 +131,7 @@ async def health_check():
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "internal_error",
@@ -118,7 +147,11 @@ if SERVE_STATIC and FRONTEND_DIR.exists():
     # Mount static assets (js, css, images) at /admin/assets/
     assets_dir = FRONTEND_DIR / "assets"
     if assets_dir.exists():
-        app.mount("/admin/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+        app.mount(
+            "/admin/assets",
+            CachedStaticFiles(directory=str(assets_dir), html=True, check_dir=False),
+            name="assets",
+        )
 
     # Serve index.html for /admin and /admin/ routes (SPA catch-all)
     @app.get("/admin")
@@ -132,7 +165,7 @@ if SERVE_STATIC and FRONTEND_DIR.exists():
         """
         # Skip API routes
         if path.startswith("api/"):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": "not_found", "message": f"API endpoint not found: /admin/{path}"}
             )
@@ -145,7 +178,7 @@ if SERVE_STATIC and FRONTEND_DIR.exists():
         # Otherwise, return index.html for SPA routing
         index_file = FRONTEND_DIR / "index.html"
         if index_file.exists():
-            return FileResponse(index_file)
+            return FileResponse(index_file, headers={"Cache-Control": NO_CACHE_CONTROL})
 
         return HTMLResponse(
             content="<html><body><h1>Admin Portal</h1><p>Frontend not built. Run 'npm run build' in frontend directory.</p></body></html>",
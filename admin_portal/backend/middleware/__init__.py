@@ -2,6 +2,7 @@
 from admin_portal.backend.middleware.cognito_auth import (
     CognitoAuthMiddleware,
     get_cognito_config,
+    get_jwt_validator,
 )
 
-__all__ = ["CognitoAuthMiddleware", "get_cognito_config"]
+__all__ = ["CognitoAuthMiddleware", "get_cognito_config", "get_jwt_validator"]
@@ -1,6 +1,7 @@
 """
 Master Key Authentication Middleware for Admin Portal.
 """
+import hmac
 import sys
 from pathlib import Path
 from typing import Callable
@@ -54,7 +55,7 @@ class MasterKeyAuthMiddleware(BaseHTTPMiddleware):
                 },
             )
 
-        if admin_key != settings.master_api_key:
+        if not hmac.compare_digest(admin_key.encode(), settings.master_api_key.encode()):
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={
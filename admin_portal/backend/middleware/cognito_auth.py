@@ -3,14 +3,18 @@ AWS Cognito Authentication Middleware for Admin Portal.
 
 Validates JWT tokens issued by AWS Cognito User Pool.
 """
+import asyncio
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Optional, Set
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Receive, Scope, Send
 
 # Add parent directory to path to import from app
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
@@ -32,8 +36,66 @@ SKIP_AUTH_PATHS: Set[str] = {
 # Path prefixes that don't require authentication (for static files and SPA routes)
 SKIP_AUTH_PATH_PREFIXES: tuple = (
     "/admin",  # SPA routes and static files - frontend handles its own auth
+    "/api/auth/config",  # Config endpoint (handles query params / trailing parts)
 )
 
+# Single compiled matcher for both lists, checked once per request
+_SKIP_AUTH_RE = re.compile(
+    "(?:%s)$|(?:%s)" % (
+        "|".join(re.escape(p) for p in sorted(SKIP_AUTH_PATHS)),
+        "|".join(re.escape(p) for p in SKIP_AUTH_PATH_PREFIXES),
+    )
+)
+
+
+@lru_cache(maxsize=1)
+def get_jwt_validator() -> Optional[CognitoJWTValidator]:
+    """
+    Get the process-wide Cognito JWT validator.
+
+    Returns:
+        The shared validator, or None if Cognito is not configured.
+    """
+    user_pool_id = os.getenv("COGNITO_USER_POOL_ID", "")
+    client_id = os.getenv("COGNITO_CLIENT_ID", "")
+    if not (user_pool_id and client_id):
+        return None
+    return CognitoJWTValidator(
+        user_pool_id=user_pool_id,
+        client_id=client_id,
+        region=os.getenv("COGNITO_REGION", os.getenv("AWS_REGION", "us-east-1")),
+    )
+
+
+_jwks_refresh_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_jwks_loop(validator: CognitoJWTValidator):
+    """Refresh the JWKS periodically so requests never wait on the fetch."""
+    while True:
+        try:
+            await asyncio.to_thread(validator.refresh_keys)
+        except CognitoJWTValidationError as e:
+            print(f"[CognitoAuth] Error refreshing JWKS: {e}")
+        await asyncio.sleep(validator.cache_ttl)
+
+
+def start_jwks_refresh():
+    """Prefetch the JWKS and keep it fresh in the background."""
+    global _jwks_refresh_task
+    validator = get_jwt_validator()
+    if validator is None or _jwks_refresh_task is not None:
+        return
+    _jwks_refresh_task = asyncio.create_task(_refresh_jwks_loop(validator))
+
+
+def stop_jwks_refresh():
+    """Stop the background JWKS refresh."""
+    global _jwks_refresh_task
+    if _jwks_refresh_task:
+        _jwks_refresh_task.cancel()
+        _jwks_refresh_task = None
+
 
 class CognitoAuthMiddleware(BaseHTTPMiddleware):
     """Middleware to authenticate admin requests using Cognito JWT tokens."""
@@ -47,14 +109,21 @@ class CognitoAuthMiddleware(BaseHTTPMiddleware):
         self.client_id = os.getenv("COGNITO_CLIENT_ID", "")
         self.region = os.getenv("COGNITO_REGION", os.getenv("AWS_REGION", "us-east-1"))
 
-        # Initialize JWT validator if configuration is available
-        self._validator: Optional[CognitoJWTValidator] = None
-        if self.user_pool_id and self.client_id:
-            self._validator = CognitoJWTValidator(
-                user_pool_id=self.user_pool_id,
-                client_id=self.client_id,
-                region=self.region,
-            )
+        # Shared JWT validator (None if Cognito is not configured)
+        self._validator: Optional[CognitoJWTValidator] = get_jwt_validator()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Hand public paths and CORS preflights straight to the app.
+
+        This runs before BaseHTTPMiddleware wraps the request, so static
+        assets and SPA routes skip the Request/streaming machinery entirely.
+        """
+        if scope["type"] == "http" and (
+            scope["method"] == "OPTIONS" or _SKIP_AUTH_RE.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
     @property
     def is_configured(self) -> bool:
@@ -79,23 +148,10 @@ class CognitoAuthMiddleware(BaseHTTPMiddleware):
         return None
 
     async def dispatch(self, request: Request, call_next: Callable):
-        """Process the request and validate JWT token."""
-        # Skip auth for certain paths
-        if request.url.path in SKIP_AUTH_PATHS:
-            return await call_next(request)
-
-        # Skip auth for path prefixes (static files, SPA routes)
-        if request.url.path.startswith(SKIP_AUTH_PATH_PREFIXES):
-            return await call_next(request)
-
-        # Skip auth for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        # Skip auth if paths start with /api/auth/config (handles query params)
-        if request.url.path.startswith("/api/auth/config"):
-            return await call_next(request)
+        """Process the request and validate JWT token.
 
+        Public paths and OPTIONS requests never reach here (see __call__).
+        """
         # Check if Cognito is configured
         if not self.is_configured:
             # Development mode - allow access without authentication
@@ -89,3 +89,4 @@ class ApiKeyListResponse(BaseModel):
     items: List[ApiKeyResponse]
     count: int
     last_key: Optional[Dict[str, Any]] = None
+    next_cursor: Optional[str] = None
@@ -10,7 +10,13 @@ from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from app.db.dynamodb import DynamoDBClient, APIKeyManager, UsageStatsManager, ModelPricingManager
+from app.db.dynamodb import (
+    get_dynamodb_client,
+    APIKeyManager,
+    UsageStatsManager,
+    ModelPricingManager,
+    UsageRollupManager,
+)
 
 
 class UsageAggregator:
@@ -29,11 +35,12 @@ class UsageAggregator:
 
     def _get_managers(self):
         """Get DynamoDB managers."""
-        db_client = DynamoDBClient()
+        db_client = get_dynamodb_client()
         return (
             APIKeyManager(db_client),
             UsageStatsManager(db_client),
             ModelPricingManager(db_client),
+            UsageRollupManager(db_client),
         )
 
     def aggregate_usage(self) -> int:
@@ -43,23 +50,22 @@ class UsageAggregator:
         Returns:
             Number of keys aggregated
         """
-        api_key_manager, usage_stats_manager, pricing_manager = self._get_managers()
-
-        # Get all API keys with pagination
-        api_keys = []
-        last_key = None
-        while True:
-            result = api_key_manager.list_all_api_keys(limit=1000, last_key=last_key)
-            api_keys.extend([item["api_key"] for item in result.get("items", [])])
-            last_key = result.get("last_key")
-            if not last_key:
-                break
+        (
+            api_key_manager,
+            usage_stats_manager,
+            pricing_manager,
+            rollup_manager,
+        ) = self._get_managers()
+
+        # Get all API keys (parallel segmented scan over the whole table)
+        api_keys = [item["api_key"] for item in api_key_manager.scan_all_api_keys()]
 
         # Aggregate usage for all keys with cost calculation
         count = usage_stats_manager.aggregate_all_usage(
             api_keys,
             pricing_manager=pricing_manager,
             api_key_manager=api_key_manager,
+            rollup_manager=rollup_manager,
         )
 
         return count
@@ -8,8 +8,9 @@ import time
 from typing import Any, Dict, Optional
 
 import httpx
-from jose import JWTError, jwt
-from jose.exceptions import ExpiredSignatureError
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import ExpiredSignatureError, JWKError
 
 
 class CognitoJWTValidationError(Exception):
@@ -48,9 +49,11 @@ class CognitoJWTValidator:
         )
         self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
 
-        # JWKS cache
+        # JWKS cache, plus the constructed verification key for each kid so
+        # validating a token never re-parses the JWK
         self._jwks_cache: Optional[Dict[str, Any]] = None
         self._cache_timestamp: float = 0
+        self._keys: Dict[str, Key] = {}
 
     def _is_cache_valid(self) -> bool:
         """Check if the JWKS cache is still valid."""
@@ -81,7 +84,7 @@ class CognitoJWTValidator:
         except httpx.HTTPError as e:
             raise CognitoJWTValidationError(f"Failed to fetch JWKS: {e}") from e
 
-    def _get_signing_key(self, token: str) -> Dict[str, Any]:
+    def _get_signing_key(self, token: str) -> Key:
         """
         Get the signing key for a token from JWKS.
 
@@ -89,7 +92,7 @@ class CognitoJWTValidator:
             token: JWT token to get key for.
 
         Returns:
-            The matching key from JWKS.
+            The constructed verification key for the token's kid.
 
         Raises:
             CognitoJWTValidationError: If no matching key is found.
@@ -104,20 +107,41 @@ class CognitoJWTValidator:
         if not kid:
             raise CognitoJWTValidationError("Token header missing 'kid'")
 
-        # Find matching key in JWKS
-        jwks = self._fetch_jwks()
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
-                return key
+        if not self._is_cache_valid():
+            self.refresh_keys()
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Key not found - keys may have rotated, refresh and try again
+        self.refresh_keys()
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        raise CognitoJWTValidationError(f"No matching key found for kid: {kid}")
+
+    def refresh_keys(self) -> None:
+        """
+        Re-fetch the JWKS and rebuild the per-kid verification keys.
 
-        # Key not found - refresh cache and try again
+        Raises:
+            CognitoJWTValidationError: If JWKS cannot be fetched.
+        """
         self._jwks_cache = None
         jwks = self._fetch_jwks()
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
-                return key
 
-        raise CognitoJWTValidationError(f"No matching key found for kid: {kid}")
+        keys: Dict[str, Key] = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get("alg", "RS256"))
+            except JWKError as e:
+                print(f"[CognitoJWTValidator] Skipping unusable JWK {kid}: {e}")
+        # Swap in one assignment so concurrent readers see a complete set
+        self._keys = keys
 
     def validate_token(self, token: str) -> Dict[str, Any]:
         """
@@ -178,11 +178,13 @@ export const apiKeysApi = {
     limit?: number;
     status?: string;
     search?: string;
+    cursor?: string;
   }): Promise<ApiKeyListResponse> => {
     const searchParams = new URLSearchParams();
     if (params?.limit) searchParams.set('limit', params.limit.toString());
     if (params?.status) searchParams.set('status', params.status);
     if (params?.search) searchParams.set('search', params.search);
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
 
     const query = searchParams.toString();
     return apiFetch(`/keys${query ? `?${query}` : ''}`);
@@ -52,6 +52,7 @@ export interface ApiKeyListResponse {
   items: ApiKey[];
   count: number;
   last_key?: string;
+  next_cursor?: string;
 }
 
 export interface ApiKeyUsage {
@@ -1,31 +1,38 @@
 """Chat completions API endpoint."""
-import json
-import time
+import asyncio
+import secrets
 from typing import Optional
-from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.core.config import settings
 from app.db.dynamodb import UsageTracker
 from app.middleware.auth import get_api_key_info
 from app.middleware.rate_limit import check_rate_limit
 from app.schemas.openai import ChatCompletionRequest, ChatCompletionResponse
-from app.services.bedrock_service import BedrockService
+from app.services.bedrock_service import USAGE_MARKER, BedrockService
 
 router = APIRouter(tags=["Chat"])
 
+# Pre-encoded SSE error frame; only the JSON-escaped message is spliced in
+_STREAM_ERROR_PREFIX = b'data: {"error":{"message":'
+_STREAM_ERROR_SUFFIX = b',"type":"server_error"}}\n\n'
+
 
 def get_bedrock_service(request: Request) -> BedrockService:
-    dynamodb_client = getattr(request.app.state, "dynamodb_client", None)
-    return BedrockService(dynamodb_client)
+    bedrock_service = getattr(request.app.state, "bedrock_service", None)
+    if bedrock_service is None:
+        dynamodb_client = getattr(request.app.state, "dynamodb_client", None)
+        bedrock_service = request.app.state.bedrock_service = BedrockService(dynamodb_client)
+    return bedrock_service
 
 
 def get_usage_tracker(request: Request) -> Optional[UsageTracker]:
-    dynamodb_client = getattr(request.app.state, "dynamodb_client", None)
-    if dynamodb_client:
-        return UsageTracker(dynamodb_client)
+    usage_writer = getattr(request.app.state, "usage_writer", None)
+    if usage_writer:
+        return usage_writer.tracker
     return None
 
 
@@ -63,8 +70,10 @@ async def create_chat_completion(
     usage_tracker: Optional[UsageTracker] = Depends(get_usage_tracker),
 ):
     """Create a chat completion (OpenAI-compatible)."""
-    request_id = f"chatcmpl-{uuid4().hex[:24]}"
-    start_time = time.time()
+    request_id = f"chatcmpl-{secrets.token_hex(12)}"
+    # Monotonic loop clock: latency only needs differences, not wall time
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     # Store api_key_info in request state for rate limiting
     request.state.api_key_info = api_key_info
@@ -100,7 +109,7 @@ async def create_chat_completion(
 
             # Record usage
             if usage_tracker:
-                latency_ms = int((time.time() - start_time) * 1000)
+                latency_ms = int((loop.time() - start_time) * 1000)
                 usage_tracker.record_usage(
                     api_key=api_key_info.get("api_key", "anonymous"),
                     request_id=request_id,
@@ -114,7 +123,7 @@ async def create_chat_completion(
                     cache_write_ttl=cache_usage.get("cache_write_ttl") or cache_ttl,
                 )
 
-            return JSONResponse(content=response.model_dump(exclude_none=True))
+            return ORJSONResponse(content=response.model_dump(exclude_none=True))
 
     except HTTPException:
         raise
@@ -166,9 +175,9 @@ async def _stream_response(
             request_data, request_id, cache_ttl=cache_ttl
         ):
             # Internal usage marker — extract but don't send to client
-            if chunk.startswith("__usage__:"):
+            if chunk.startswith(USAGE_MARKER):
                 try:
-                    usage_data = json.loads(chunk[len("__usage__:"):])
+                    usage_data = orjson.loads(chunk[len(USAGE_MARKER):])
                     prompt_tokens = usage_data.get("prompt_tokens", 0)
                     completion_tokens = usage_data.get("completion_tokens", 0)
                     cached_tokens = usage_data.get("cached_tokens", 0)
@@ -182,12 +191,12 @@ async def _stream_response(
     except Exception as e:
         success = False
         error_message = str(e)
-        yield f"data: {json.dumps({'error': {'message': str(e), 'type': 'server_error'}})}\n\n"
+        yield _STREAM_ERROR_PREFIX + orjson.dumps(error_message) + _STREAM_ERROR_SUFFIX
 
     finally:
         # Record usage
         if usage_tracker:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((asyncio.get_running_loop().time() - start_time) * 1000)
             usage_tracker.record_usage(
                 api_key=api_key_info.get("api_key", "anonymous"),
                 request_id=request_id,
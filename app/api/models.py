@@ -1,6 +1,7 @@
 """Models API endpoint."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from app.api.chat import get_bedrock_service
 from app.middleware.auth import get_api_key_info
 from app.schemas.openai import Model, ModelList
 from app.services.bedrock_service import BedrockService
@@ -8,19 +9,14 @@ from app.services.bedrock_service import BedrockService
 router = APIRouter(tags=["Models"])
 
 
-def get_bedrock_service() -> BedrockService:
-    return BedrockService()
-
-
 @router.get("/v1/models", response_model=ModelList)
 async def list_models(
     api_key_info: dict = Depends(get_api_key_info),
     bedrock_service: BedrockService = Depends(get_bedrock_service),
 ):
     """List available models."""
-    models_data = bedrock_service.list_models()
-    models = [Model(**m) for m in models_data]
-    return ModelList(data=models)
+    # Pre-encoded body; response_model only documents the schema
+    return Response(content=bedrock_service.models_json, media_type="application/json")
 
 
 @router.get("/v1/models/{model_id}", response_model=Model)
@@ -1,24 +1,99 @@
 """Convert Bedrock Converse API response to OpenAI format."""
-import json
-import time
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+import secrets
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
 
+import orjson
+
+from app.core.clock import now_seconds
 from app.schemas.openai import (
     ChatCompletionResponse,
-    ChatCompletionChunk,
     Choice,
     ChoiceMessage,
-    StreamChoice,
-    DeltaMessage,
     ToolCall,
     FunctionCall,
     Usage,
     PromptTokensDetails,
     CacheCreation,
+    CacheCreationDict,
+    ChatCompletionChunkDict,
+    DeltaMessageDict,
+    PromptTokensDetailsDict,
+    ToolCallDict,
 )
 
 
+# Bedrock stopReason -> OpenAI finish_reason
+STOP_REASON_MAP: Final[Dict[str, str]] = {
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "max_tokens": "length",
+    "tool_use": "tool_calls",
+    "content_filtered": "content_filter",
+}
+
+
+def _delta(
+    role: Optional[str] = None,
+    content: Optional[str] = None,
+    tool_calls: Optional[List[ToolCallDict]] = None,
+) -> DeltaMessageDict:
+    """Plain-dict DeltaMessage."""
+    return {"role": role, "content": content, "tool_calls": tool_calls}
+
+
+def _tool_call(index: int, tool_id: str, name: str, arguments: str) -> ToolCallDict:
+    """Plain-dict streaming ToolCall."""
+    return {
+        "index": index,
+        "id": tool_id,
+        "type": "function",
+        "function": {"name": name, "arguments": arguments},
+    }
+
+
+def _chunk_frame(
+    request_id: str,
+    model: str,
+    created: int,
+    delta: DeltaMessageDict,
+    finish_reason: Optional[str] = None,
+) -> bytes:
+    """Encode a single-choice ChatCompletionChunk as an SSE data frame."""
+    chunk: ChatCompletionChunkDict = {
+        "id": request_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        "usage": None,
+    }
+    return b"data: " + orjson.dumps(chunk) + b"\n\n"
+
+
+# Frames whose only variable fields are id, created and model. id/model are
+# spliced in as orjson-encoded JSON strings so no escaping can be skipped.
+_START_TMPL = (
+    b'data: {"id":%b,"object":"chat.completion.chunk","created":%d,"model":%b,'
+    b'"choices":[{"index":0,"delta":{"role":"assistant","content":null,"tool_calls":null},'
+    b'"finish_reason":null}],"usage":null}\n\n'
+)
+_STOP_TMPLS = {
+    finish_reason: (
+        b'data: {"id":%b,"object":"chat.completion.chunk","created":%d,"model":%b,'
+        b'"choices":[{"index":0,"delta":{"role":null,"content":null,"tool_calls":null},'
+        b'"finish_reason":"' + finish_reason.encode() + b'"}],"usage":null}\n\n'
+    )
+    for finish_reason in ("stop", "length", "tool_calls", "content_filter")
+}
+DONE_FRAME = b"data: [DONE]\n\n"
+
+# Stream events that can produce a frame; everything else is skipped early
+_HANDLED_STREAM_EVENTS = frozenset(
+    {"messageStart", "contentBlockDelta", "contentBlockStart", "messageStop"}
+)
+_EMPTY: Tuple[bytes, ...] = ()
+
+
 class BedrockToOpenAIConverter:
     """Converts Bedrock Converse responses to OpenAI format."""
 
@@ -26,54 +101,56 @@ class BedrockToOpenAIConverter:
         # Streaming state: maps content block index -> (toolUseId, name, tool_call_index)
         self._stream_tool_state: Dict[int, Dict[str, Any]] = {}
         self._stream_tool_call_count: int = 0
+        # Timestamp shared by every chunk of the stream
+        self._stream_created: Optional[int] = None
 
-    STOP_REASON_MAP = {
-        "end_turn": "stop",
-        "stop_sequence": "stop",
-        "max_tokens": "length",
-        "tool_use": "tool_calls",
-        "content_filtered": "content_filter",
-    }
+    # Kept for callers that read it off the class
+    STOP_REASON_MAP = STOP_REASON_MAP
 
     def convert_response(
         self, bedrock_response: Dict[str, Any], model: str, request_id: Optional[str] = None,
         cache_ttl: Optional[str] = None,
     ) -> ChatCompletionResponse:
-        """Convert Bedrock response to OpenAI ChatCompletion format."""
-        response_id = request_id or f"chatcmpl-{uuid4().hex[:24]}"
+        """Convert Bedrock response to OpenAI ChatCompletion format.
+
+        Every field is built here from Bedrock's typed response, so the
+        models are assembled with model_construct and skip validation.
+        """
+        response_id = request_id or f"chatcmpl-{secrets.token_hex(12)}"
 
         # Extract content
-        output = bedrock_response.get("output", {})
-        message = output.get("message", {})
-        content_blocks = message.get("content", [])
+        content_blocks = bedrock_response.get("output", {}).get("message", {}).get("content", ())
 
         # Build response content
-        text_content = ""
+        text_parts = []
         tool_calls = []
         thinking_content = None
 
         for block in content_blocks:
-            if "text" in block:
-                text_content += block["text"]
-            elif "toolUse" in block:
-                tu = block["toolUse"]
+            text = block.get("text")
+            if text is not None:
+                text_parts.append(text)
+                continue
+            tu = block.get("toolUse")
+            if tu is not None:
                 tool_calls.append(
-                    ToolCall(
-                        id=tu.get("toolUseId", f"call_{uuid4().hex[:24]}"),
+                    ToolCall.model_construct(
+                        id=tu.get("toolUseId") or f"call_{secrets.token_hex(12)}",
                         type="function",
-                        function=FunctionCall(
+                        function=FunctionCall.model_construct(
                             name=tu.get("name", ""),
-                            arguments=json.dumps(tu.get("input", {})),
+                            arguments=orjson.dumps(tu.get("input", {})).decode(),
                         ),
                     )
                 )
-            elif "reasoningContent" in block:
-                rc = block["reasoningContent"]
-                if "reasoningText" in rc:
-                    thinking_content = rc["reasoningText"].get("text", "")
+                continue
+            rc = block.get("reasoningContent")
+            if rc is not None and "reasoningText" in rc:
+                thinking_content = rc["reasoningText"].get("text", "")
 
         # Build message
-        choice_message = ChoiceMessage(
+        text_content = "".join(text_parts)
+        choice_message = ChoiceMessage.model_construct(
             role="assistant",
             content=text_content if text_content else None,
             tool_calls=tool_calls if tool_calls else None,
@@ -81,10 +158,10 @@ class BedrockToOpenAIConverter:
         )
 
         # Stop reason
-        stop_reason = bedrock_response.get("stopReason", "end_turn")
-        finish_reason = self.STOP_REASON_MAP.get(stop_reason, "stop")
         if tool_calls:
             finish_reason = "tool_calls"
+        else:
+            finish_reason = STOP_REASON_MAP.get(bedrock_response.get("stopReason"), "stop")
 
         # Usage - prompt_tokens includes all input tokens (OpenAI convention)
         # Bedrock splits: inputTokens (non-cached) + cacheReadInputTokens + cacheWriteInputTokens
@@ -94,33 +171,34 @@ class BedrockToOpenAIConverter:
         cache_write = usage_data.get("cacheWriteInputTokens", 0)
         output_tokens = usage_data.get("outputTokens", 0)
         prompt_tokens = input_tokens + cache_read + cache_write
+        total_tokens = prompt_tokens + output_tokens
 
         prompt_details = None
         cache_creation = None
         if cache_read > 0 or cache_write > 0:
-            prompt_details = PromptTokensDetails(cached_tokens=cache_read)
+            prompt_details = PromptTokensDetails.model_construct(cached_tokens=cache_read)
             ttl = cache_ttl or "5m"
-            cache_creation = CacheCreation(
+            cache_creation = CacheCreation.model_construct(
                 ephemeral_5m_input_tokens=cache_write if ttl == "5m" else 0,
                 ephemeral_1h_input_tokens=cache_write if ttl == "1h" else 0,
             )
 
-        usage = Usage(
+        usage = Usage.model_construct(
             prompt_tokens=prompt_tokens,
             completion_tokens=output_tokens,
-            total_tokens=prompt_tokens + output_tokens,
+            total_tokens=total_tokens,
             prompt_tokens_details=prompt_details,
             cache_creation_input_tokens=cache_write,
             cache_read_input_tokens=cache_read,
             cache_creation=cache_creation,
         )
 
-        return ChatCompletionResponse(
+        return ChatCompletionResponse.model_construct(
             id=response_id,
-            created=int(time.time()),
+            created=now_seconds(),
             model=model,
             choices=[
-                Choice(
+                Choice.model_construct(
                     index=0,
                     message=choice_message,
                     finish_reason=finish_reason,
@@ -135,33 +213,69 @@ class BedrockToOpenAIConverter:
         model: str,
         request_id: str,
         current_index: int = 0,
-    ) -> List[str]:
-        """Convert Bedrock stream event to OpenAI SSE format."""
-        events = []
+        created: Optional[int] = None,
+    ) -> Sequence[bytes]:
+        """Convert Bedrock stream event to OpenAI SSE frames.
+
+        This runs once per streamed token, so chunks are built as plain dicts
+        with the same shape as ChatCompletionChunk and encoded with orjson.
+        All chunks carry the same ``created``: the caller's value, or one
+        taken on the first event of the stream.
+
+        Each event yields at most one frame; events that produce nothing
+        (metadata, contentBlockStop, ...) return a shared empty tuple.
+        """
+        # Each Converse stream event carries exactly one top-level key
+        kind = next(iter(event), None)
+        if kind not in _HANDLED_STREAM_EVENTS:
+            return _EMPTY
+
+        if created is None:
+            created = self._stream_created
+            if created is None:
+                created = self._stream_created = now_seconds()
 
         # Message start
-        if "messageStart" in event:
+        if kind == "messageStart":
             self._stream_tool_state.clear()
             self._stream_tool_call_count = 0
-            chunk = ChatCompletionChunk(
-                id=request_id,
-                model=model,
-                choices=[
-                    StreamChoice(
-                        index=0,
-                        delta=DeltaMessage(role="assistant"),
-                        finish_reason=None,
-                    )
-                ],
-            )
-            events.append(f"data: {chunk.model_dump_json()}\n\n")
-
-        # Content block start (for tool use) — must be before delta to populate state
-        elif "contentBlockStart" in event:
-            block_index = event["contentBlockStart"].get("contentBlockIndex", current_index)
-            start = event["contentBlockStart"].get("start", {})
-            if "toolUse" in start:
-                tu = start["toolUse"]
+            return (_START_TMPL % (
+                orjson.dumps(request_id), created, orjson.dumps(model)
+            ),)
+
+        # Content block delta (the per-token event, so checked first)
+        elif kind == "contentBlockDelta":
+            block_delta = event["contentBlockDelta"]
+            delta = block_delta.get("delta")
+            if not delta:
+                return _EMPTY
+
+            text = delta.get("text")
+            if text is not None:
+                return (_chunk_frame(request_id, model, created, _delta(content=text)),)
+
+            tool_use = delta.get("toolUse")
+            input_chunk = tool_use.get("input") if tool_use else None
+            if input_chunk:
+                # Look up id/name/index from contentBlockStart state using block index
+                block_index = block_delta.get("contentBlockIndex", current_index)
+                state = self._stream_tool_state.get(block_index)
+                if state is None:
+                    state = {"id": f"call_{current_index}", "name": "", "index": 0}
+                return (_chunk_frame(
+                    request_id, model, created,
+                    _delta(tool_calls=[
+                        _tool_call(state["index"], state["id"], state["name"], input_chunk)
+                    ]),
+                ),)
+
+        # Content block start (for tool use) — populates state for later deltas
+        elif kind == "contentBlockStart":
+            block_start = event["contentBlockStart"]
+            start = block_start.get("start")
+            tu = start.get("toolUse") if start else None
+            if tu is not None:
+                block_index = block_start.get("contentBlockIndex", current_index)
                 tool_id = tu.get("toolUseId", f"call_{current_index}")
                 tool_name = tu.get("name", "")
                 tool_call_idx = self._stream_tool_call_count
@@ -170,103 +284,23 @@ class BedrockToOpenAIConverter:
                 self._stream_tool_state[block_index] = {
                     "id": tool_id, "name": tool_name, "index": tool_call_idx
                 }
-                tool_call = ToolCall(
-                    index=tool_call_idx,
-                    id=tool_id,
-                    type="function",
-                    function=FunctionCall(
-                        name=tool_name,
-                        arguments="",
-                    ),
-                )
-                chunk = ChatCompletionChunk(
-                    id=request_id,
-                    model=model,
-                    choices=[
-                        StreamChoice(
-                            index=0,
-                            delta=DeltaMessage(tool_calls=[tool_call]),
-                            finish_reason=None,
-                        )
-                    ],
-                )
-                events.append(f"data: {chunk.model_dump_json()}\n\n")
-
-        # Content block delta
-        elif "contentBlockDelta" in event:
-            delta = event["contentBlockDelta"].get("delta", {})
-
-            if "text" in delta:
-                chunk = ChatCompletionChunk(
-                    id=request_id,
-                    model=model,
-                    choices=[
-                        StreamChoice(
-                            index=0,
-                            delta=DeltaMessage(content=delta["text"]),
-                            finish_reason=None,
-                        )
-                    ],
-                )
-                events.append(f"data: {chunk.model_dump_json()}\n\n")
-
-            elif "toolUse" in delta:
-                tu = delta["toolUse"]
-                if "input" in tu:
-                    input_chunk = tu.get("input", "")
-                    if input_chunk:
-                        # Look up id/name/index from contentBlockStart state using block index
-                        block_index = event["contentBlockDelta"].get("contentBlockIndex", current_index)
-                        state = self._stream_tool_state.get(
-                            block_index, {"id": f"call_{current_index}", "name": "", "index": 0}
-                        )
-                        tool_call = ToolCall(
-                            index=state["index"],
-                            id=state["id"],
-                            type="function",
-                            function=FunctionCall(
-                                name=state["name"],
-                                arguments=input_chunk,
-                            ),
-                        )
-                        chunk = ChatCompletionChunk(
-                            id=request_id,
-                            model=model,
-                            choices=[
-                                StreamChoice(
-                                    index=0,
-                                    delta=DeltaMessage(tool_calls=[tool_call]),
-                                    finish_reason=None,
-                                )
-                            ],
-                        )
-                        events.append(f"data: {chunk.model_dump_json()}\n\n")
+                return (_chunk_frame(
+                    request_id, model, created,
+                    _delta(tool_calls=[_tool_call(tool_call_idx, tool_id, tool_name, "")]),
+                ),)
 
         # Message stop
-        elif "messageStop" in event:
+        elif kind == "messageStop":
             stop_reason = event["messageStop"].get("stopReason", "end_turn")
-            finish_reason = self.STOP_REASON_MAP.get(stop_reason, "stop")
-
-            chunk = ChatCompletionChunk(
-                id=request_id,
-                model=model,
-                choices=[
-                    StreamChoice(
-                        index=0,
-                        delta=DeltaMessage(),
-                        finish_reason=finish_reason,
-                    )
-                ],
-            )
-            events.append(f"data: {chunk.model_dump_json()}\n\n")
+            finish_reason = STOP_REASON_MAP.get(stop_reason, "stop")
             # Note: [DONE] is appended by the caller after optional usage chunk
+            return (_STOP_TMPLS[finish_reason] % (
+                orjson.dumps(request_id), created, orjson.dumps(model)
+            ),)
 
-        # Metadata event (contains usage)
-        elif "metadata" in event:
-            # Usage is extracted by the caller via extract_stream_usage()
-            pass
+        # metadata (usage) is extracted by the caller via extract_stream_usage()
 
-        return events
+        return _EMPTY
 
     def extract_stream_usage(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract usage data from a metadata stream event."""
@@ -320,34 +354,36 @@ class BedrockToOpenAIConverter:
     def build_usage_chunk(
         self, request_id: str, model: str, usage_data: Dict[str, Any],
         cache_ttl: Optional[str] = None,
-    ) -> str:
+        created: Optional[int] = None,
+    ) -> bytes:
         """Build a final SSE chunk containing usage statistics."""
-        prompt_details = None
-        cache_creation = None
+        prompt_details: Optional[PromptTokensDetailsDict] = None
+        cache_creation: Optional[CacheCreationDict] = None
         cached = usage_data.get("cached_tokens", 0)
         cache_write = usage_data.get("cache_write_tokens", 0)
 
         if cached > 0 or cache_write > 0:
-            prompt_details = PromptTokensDetails(cached_tokens=cached)
+            prompt_details = {"cached_tokens": cached}
             ttl = cache_ttl or "5m"
-            cache_creation = CacheCreation(
-                ephemeral_5m_input_tokens=cache_write if ttl == "5m" else 0,
-                ephemeral_1h_input_tokens=cache_write if ttl == "1h" else 0,
-            )
-
-        usage = Usage(
-            prompt_tokens=usage_data.get("prompt_tokens", 0),
-            completion_tokens=usage_data.get("completion_tokens", 0),
-            total_tokens=usage_data.get("total_tokens", 0),
-            prompt_tokens_details=prompt_details,
-            cache_creation_input_tokens=cache_write,
-            cache_read_input_tokens=cached,
-            cache_creation=cache_creation,
-        )
-        chunk = ChatCompletionChunk(
-            id=request_id,
-            model=model,
-            choices=[],
-            usage=usage,
-        )
-        return f"data: {chunk.model_dump_json()}\n\n"
+            cache_creation = {
+                "ephemeral_5m_input_tokens": cache_write if ttl == "5m" else 0,
+                "ephemeral_1h_input_tokens": cache_write if ttl == "1h" else 0,
+            }
+
+        chunk: ChatCompletionChunkDict = {
+            "id": request_id,
+            "object": "chat.completion.chunk",
+            "created": created or self._stream_created or now_seconds(),
+            "model": model,
+            "choices": [],
+            "usage": {
+                "prompt_tokens": usage_data.get("prompt_tokens", 0),
+                "completion_tokens": usage_data.get("completion_tokens", 0),
+                "total_tokens": usage_data.get("total_tokens", 0),
+                "prompt_tokens_details": prompt_details,
+                "cache_creation_input_tokens": cache_write,
+                "cache_read_input_tokens": cached,
+                "cache_creation": cache_creation,
+            },
+        }
+        return b"data: " + orjson.dumps(chunk) + b"\n\n"
@@ -1,11 +1,16 @@
 """Convert OpenAI API format to Bedrock Converse API format."""
+import asyncio
 import base64
+import importlib.util
 import json as json_module
-import re
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
+import orjson
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.db.dynamodb import ModelMappingManager
 from app.schemas.openai import ChatCompletionRequest, Message, Tool
 
 # Reasoning effort to thinking budget_tokens mapping
@@ -30,36 +35,94 @@ MODEL_CACHE_MIN_TOKENS = {
     "claude-haiku-4-5": 2048,
 }
 
+# Feature flags and tuning read once: settings are fixed after startup
+_ENABLE_TOOL_USE = settings.enable_tool_use
+_ENABLE_VISION = settings.enable_vision
+_ENABLE_EXTENDED_THINKING = settings.enable_extended_thinking
+_PROMPT_CACHE_MIN_TOKENS = settings.prompt_cache_min_tokens
+# Read-only view: shared by every request, so nothing may mutate it
+_DEFAULT_MODEL_MAPPING = MappingProxyType(dict(settings.default_model_mapping))
+
+_NOT_CACHED = object()
+
+# Shared client for image URL downloads so connections (and TLS sessions)
+# are reused across requests. HTTP/2 lets concurrent downloads from one host
+# share a connection; it needs the h2 package (httpx[http2]).
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide HTTP client used to fetch images."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=30,
+            headers={"User-Agent": f"{settings.app_name}/{settings.app_version}"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class OpenAIToBedrockConverter:
     """Converts OpenAI Chat Completion requests to Bedrock Converse format."""
 
+    # Converted text-only, non-streaming requests without tools, keyed by
+    # the request's JSON; repeated prompts (evals, retries) skip conversion
+    _request_cache = TTLCache(ttl_seconds=60, maxsize=256)
+
     def __init__(self, dynamodb_client=None):
-        self.model_mapping = settings.default_model_mapping
         self.dynamodb_client = dynamodb_client
-        self._resolved_model_id: Optional[str] = None
 
-    def convert_request(
+    async def convert_request(
         self, request: ChatCompletionRequest, cache_ttl: Optional[str] = None
     ) -> Dict[str, Any]:
         """Convert OpenAI request to Bedrock Converse format.
 
+        Image URLs in the messages are downloaded concurrently.
+
         Args:
             cache_ttl: Resolved cache TTL ("5m", "1h") or None to disable caching.
         """
-        self._resolved_model_id = self._convert_model_id(request.model)
-
+        # Keep the resolved id local: one converter instance is shared by
+        # concurrent requests
+        if self.dynamodb_client and ModelMappingManager.get_cached_mapping(
+            request.model, _NOT_CACHED
+        ) is _NOT_CACHED:
+            # Uncached custom mapping is a DynamoDB lookup; keep it off the event loop
+            resolved_model_id = await asyncio.to_thread(self._convert_model_id, request.model)
+        else:
+            resolved_model_id = self._convert_model_id(request.model)
+
+        cache_key = self._request_cache_key(request, cache_ttl, resolved_model_id)
+        if cache_key is not None:
+            cached = self._request_cache.get(cache_key)
+            if cached is not None:
+                # Stored encoded: every hit gets its own nested objects, so
+                # no request can mutate another's messages or config
+                return orjson.loads(cached)
+
+        # One pass over the messages yields both the turns and the system prompt
+        messages, system_content = await self._convert_messages(request.messages)
         bedrock_request = {
-            "modelId": self._resolved_model_id,
-            "messages": self._convert_messages(request.messages),
+            "modelId": resolved_model_id,
+            "messages": messages,
             "inferenceConfig": self._build_inference_config(request),
         }
 
         # Check for explicit cache_control in user content
         has_explicit_cache = self._has_explicit_cache_control(request)
 
-        # Extract system message and inject response_format instructions
-        system_content = self._extract_system(request.messages)
+        # Inject response_format instructions into the system prompt
         if request.response_format:
             format_instruction = self._build_response_format_instruction(request.response_format)
             if format_instruction:
@@ -70,24 +133,24 @@ class OpenAIToBedrockConverter:
             bedrock_request["system"] = system_content
 
         # Convert tools
-        if request.tools and settings.enable_tool_use:
+        if request.tools and _ENABLE_TOOL_USE:
             bedrock_request["toolConfig"] = self._convert_tools(request.tools, request.tool_choice)
 
         # Inject cache points (automatic mode)
         if cache_ttl and not has_explicit_cache:
-            if self._model_supports_caching(request.model, self._resolved_model_id):
+            if self._model_supports_caching(request.model, resolved_model_id):
                 self._inject_cache_points(bedrock_request, cache_ttl, request.model)
 
         # Handle explicit cache_control from client
         if has_explicit_cache and cache_ttl:
-            if self._model_supports_caching(request.model, self._resolved_model_id):
+            if self._model_supports_caching(request.model, resolved_model_id):
                 self._apply_explicit_cache_control(bedrock_request, request, cache_ttl)
 
         # Extended thinking: explicit thinking takes precedence over reasoning_effort
         thinking_config = None
-        if request.thinking and settings.enable_extended_thinking:
+        if request.thinking and _ENABLE_EXTENDED_THINKING:
             thinking_config = request.thinking
-        elif request.reasoning_effort and settings.enable_extended_thinking:
+        elif request.reasoning_effort and _ENABLE_EXTENDED_THINKING:
             budget = REASONING_EFFORT_MAP.get(request.reasoning_effort, 10000)
             thinking_config = {"type": "enabled", "budget_tokens": budget}
 
@@ -104,14 +167,32 @@ class OpenAIToBedrockConverter:
             if current_max <= budget:
                 bedrock_request["inferenceConfig"]["maxTokens"] = budget + 4096
 
+        if cache_key is not None:
+            self._request_cache.set(cache_key, orjson.dumps(bedrock_request))
         return bedrock_request
 
+    @staticmethod
+    def _request_cache_key(
+        request: ChatCompletionRequest, cache_ttl: Optional[str], resolved_model_id: str
+    ) -> Optional[Tuple[str, Optional[str], str]]:
+        """Conversion cache key, or None if the request is not worth caching.
+
+        Only non-streaming, text-only requests without tools are cached,
+        which bounds the key space and keeps image bytes out of the cache.
+        The resolved model id is part of the key, so mapping changes apply.
+        """
+        if request.stream or request.tools:
+            return None
+        for message in request.messages:
+            if message.tool_calls or not (message.content is None or isinstance(message.content, str)):
+                return None
+        return (resolved_model_id, cache_ttl, request.model_dump_json())
+
     def _convert_model_id(self, openai_model_id: str) -> str:
         """Convert OpenAI model ID to Bedrock model ID."""
-        # Check DynamoDB custom mapping first
+        # Check DynamoDB custom mapping first (cached, see ModelMappingManager)
         if self.dynamodb_client:
             try:
-                from app.db.dynamodb import ModelMappingManager
                 manager = ModelMappingManager(self.dynamodb_client)
                 custom = manager.get_mapping(openai_model_id)
                 if custom:
@@ -120,27 +201,39 @@ class OpenAIToBedrockConverter:
                 pass
 
         # Default mapping
-        if openai_model_id in self.model_mapping:
-            return self.model_mapping[openai_model_id]
+        default = _DEFAULT_MODEL_MAPPING.get(openai_model_id)
+        if default is not None:
+            return default
 
         # Pass-through
         return openai_model_id
 
-    def _convert_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
-        """Convert messages, excluding system messages.
+    async def _convert_messages(
+        self, messages: List[Message]
+    ) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+        """Convert messages to Bedrock turns and collect system messages.
+
+        Returns (messages, system), where system is None if there are no
+        system messages.
 
         Consecutive messages with the same Bedrock role (e.g. multiple tool
         results that all map to "user") are merged into a single message,
         because Bedrock requires strictly alternating user/assistant turns.
+
+        Image URLs are left as placeholder blocks during conversion and then
+        downloaded all at once; images that fail to download are dropped.
         """
         bedrock_messages = []
+        system_parts = []
+        pending_images: List[Tuple[Dict[str, Any], str]] = []
 
         for msg in messages:
             if msg.role == "system":
-                continue  # System handled separately
+                self._append_system(msg, system_parts)
+                continue
 
             role = "user" if msg.role in ("user", "tool") else "assistant"
-            content = self._convert_content(msg)
+            content = self._convert_content(msg, pending_images)
 
             # Merge into previous message when roles match (consecutive tool results, etc.)
             if bedrock_messages and bedrock_messages[-1]["role"] == role:
@@ -148,101 +241,138 @@ class OpenAIToBedrockConverter:
             else:
                 bedrock_messages.append({"role": role, "content": content})
 
-        return bedrock_messages
-
-    def _convert_content(self, msg: Message) -> List[Dict[str, Any]]:
-        """Convert message content to Bedrock format."""
-        content = []
-
-        # Handle tool result
-        if msg.role == "tool" and msg.tool_call_id:
+        if pending_images:
+            results = await asyncio.gather(
+                *(self._fetch_image(url) for _, url in pending_images)
+            )
+            failed = False
+            for (block, _), image_data in zip(pending_images, results):
+                if image_data:
+                    block["image"] = image_data
+                else:
+                    failed = True
+            if failed:
+                for message in bedrock_messages:
+                    content = [b for b in message["content"] if b.get("image", True) is not None]
+                    message["content"] = content or [{"text": ""}]
+
+        return bedrock_messages, system_parts or None
+
+    def _convert_content(
+        self, msg: Message, pending_images: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Dict[str, Any]]:
+        """Convert message content to Bedrock format.
+
+        Image URLs that need downloading are appended to pending_images as
+        (block, url) and filled in by the caller.
+        """
+        role = msg.role
+        if role == "tool" and msg.tool_call_id:
+            return self._convert_tool_result(msg)
+        if role == "assistant" and msg.tool_calls:
+            return self._convert_assistant_tool_calls(msg)
+
+        content = msg.content
+        # Plain string content is by far the most common case
+        if type(content) is str:
+            return [{"text": content}]
+        if type(content) is list:
+            return self._convert_content_parts(content, pending_images)
+        return [{"text": ""}]
+
+    def _convert_tool_result(self, msg: Message) -> List[Dict[str, Any]]:
+        """Convert a tool message to a Bedrock toolResult block."""
+        return [{
+            "toolResult": {
+                "toolUseId": msg.tool_call_id,
+                "content": [{"text": msg.content or ""}],
+                "status": "success",
+            }
+        }]
+
+    def _convert_assistant_tool_calls(self, msg: Message) -> List[Dict[str, Any]]:
+        """Convert an assistant message with tool calls to toolUse blocks."""
+        content = [{"text": msg.content}] if msg.content else []
+        for tc in msg.tool_calls:
             content.append({
-                "toolResult": {
-                    "toolUseId": msg.tool_call_id,
-                    "content": [{"text": msg.content or ""}],
-                    "status": "success",
+                "toolUse": {
+                    "toolUseId": tc.id,
+                    "name": tc.function.name,
+                    "input": self._parse_json_safe(tc.function.arguments),
                 }
             })
-            return content
-
-        # Handle assistant tool calls
-        if msg.role == "assistant" and msg.tool_calls:
-            for tc in msg.tool_calls:
-                content.append({
-                    "toolUse": {
-                        "toolUseId": tc.id,
-                        "name": tc.function.name,
-                        "input": self._parse_json_safe(tc.function.arguments),
-                    }
-                })
-            if msg.content:
-                content.insert(0, {"text": msg.content})
-            return content
-
-        # Handle string content
-        if isinstance(msg.content, str):
-            return [{"text": msg.content}]
-
-        # Handle array content (vision)
-        if isinstance(msg.content, list):
-            for part in msg.content:
-                if hasattr(part, "type"):
-                    if part.type == "text":
-                        content.append({"text": part.text})
-                    elif part.type == "image_url" and settings.enable_vision:
-                        image_data = self._process_image(part.image_url.url)
-                        if image_data:
-                            content.append({"image": image_data})
-                elif isinstance(part, dict):
-                    if part.get("type") == "text":
-                        content.append({"text": part.get("text", "")})
-                    elif part.get("type") == "image_url" and settings.enable_vision:
-                        url = part.get("image_url", {}).get("url", "")
-                        image_data = self._process_image(url)
-                        if image_data:
-                            content.append({"image": image_data})
+        return content
+
+    def _convert_content_parts(
+        self, parts: List[Any], pending_images: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Dict[str, Any]]:
+        """Convert array content (text and vision parts)."""
+        content = []
+        for part in parts:
+            # Validated parts are TextContent/ImageContent models; raw dicts
+            # are accepted as well
+            is_dict = type(part) is dict
+            part_type = part.get("type") if is_dict else getattr(part, "type", None)
+            if part_type == "text":
+                content.append({"text": part.get("text", "") if is_dict else part.text})
+            elif part_type == "image_url" and _ENABLE_VISION:
+                url = part.get("image_url", {}).get("url", "") if is_dict else part.image_url.url
+                image_block = self._image_block(url, pending_images)
+                if image_block:
+                    content.append(image_block)
 
         return content if content else [{"text": ""}]
 
+    def _image_block(
+        self, url: str, pending_images: List[Tuple[Dict[str, Any], str]]
+    ) -> Optional[Dict[str, Any]]:
+        """Build an image content block, deferring remote URLs to pending_images."""
+        if url.startswith(("http://", "https://")):
+            block = {"image": None}
+            pending_images.append((block, url))
+            return block
+        image_data = self._process_image(url)
+        return {"image": image_data} if image_data else None
+
     def _process_image(self, url: str) -> Optional[Dict[str, Any]]:
-        """Process image URL to Bedrock format."""
-        if url.startswith("data:"):
-            # Base64 data URL
-            match = re.match(r"data:image/(\w+);base64,(.+)", url)
-            if match:
-                fmt = match.group(1)
-                data = match.group(2)
-                return {
-                    "format": fmt,
-                    "source": {"bytes": base64.b64decode(data)},
-                }
-        elif url.startswith(("http://", "https://")):
-            # Download image
-            try:
-                resp = httpx.get(url, timeout=30)
-                resp.raise_for_status()
-                content_type = resp.headers.get("content-type", "image/jpeg")
-                fmt = content_type.split("/")[-1].split(";")[0]
+        """Process a base64 data URL (data:image/<fmt>;base64,<data>) to Bedrock format.
+
+        Parsed by slicing rather than a regex so the (possibly multi-MB)
+        payload is not copied into an intermediate match group.
+        """
+        if url.startswith("data:image/"):
+            sep = url.find(";base64,", 11)
+            fmt = url[11:sep]
+            if sep != -1 and fmt.isalnum() and len(url) > sep + 8:
                 return {
                     "format": fmt,
-                    "source": {"bytes": resp.content},
+                    "source": {"bytes": base64.b64decode(url[sep + 8:])},
                 }
-            except Exception:
-                return None
         return None
 
-    def _extract_system(self, messages: List[Message]) -> Optional[List[Dict[str, Any]]]:
-        """Extract system messages."""
-        system_parts = []
-        for msg in messages:
-            if msg.role == "system" and msg.content:
-                if isinstance(msg.content, str):
-                    system_parts.append({"text": msg.content})
-                elif isinstance(msg.content, list):
-                    for part in msg.content:
-                        if hasattr(part, "text"):
-                            system_parts.append({"text": part.text})
-        return system_parts if system_parts else None
+    async def _fetch_image(self, url: str) -> Optional[Dict[str, Any]]:
+        """Download an image URL and convert it to Bedrock format."""
+        try:
+            resp = await get_http_client().get(url)
+            resp.raise_for_status()
+            content_type = resp.headers.get("content-type", "image/jpeg")
+            fmt = content_type.split("/")[-1].split(";")[0]
+            return {
+                "format": fmt,
+                "source": {"bytes": resp.content},
+            }
+        except Exception:
+            return None
+
+    def _append_system(self, msg: Message, system_parts: List[Dict[str, Any]]) -> None:
+        """Append a system message's text blocks to system_parts."""
+        if msg.content:
+            if isinstance(msg.content, str):
+                system_parts.append({"text": msg.content})
+            elif isinstance(msg.content, list):
+                for part in msg.content:
+                    if hasattr(part, "text"):
+                        system_parts.append({"text": part.text})
 
     def _build_inference_config(self, request: ChatCompletionRequest) -> Dict[str, Any]:
         """Build inference configuration."""
@@ -330,9 +460,8 @@ class OpenAIToBedrockConverter:
 
     def _parse_json_safe(self, s: str) -> Dict[str, Any]:
         """Safely parse JSON string."""
-        import json
         try:
-            return json.loads(s)
+            return orjson.loads(s)
         except Exception:
             return {}
 
@@ -398,7 +527,7 @@ class OpenAIToBedrockConverter:
           3. Message boundary (where cumulative tokens first >= threshold)
         """
         cache_point = {"cachePoint": {"type": "default", "ttl": ttl}}
-        min_tokens = MODEL_CACHE_MIN_TOKENS.get(model, settings.prompt_cache_min_tokens)
+        min_tokens = MODEL_CACHE_MIN_TOKENS.get(model, _PROMPT_CACHE_MIN_TOKENS)
         cumulative_tokens = 0.0
         cache_placed = False
 
@@ -486,6 +615,3 @@ class OpenAIToBedrockConverter:
                     block_offset += 1
             else:
                 block_offset += 1
-
-    def get_resolved_model_id(self) -> Optional[str]:
-        return self._resolved_model_id
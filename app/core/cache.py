@@ -0,0 +1,93 @@
+"""In-process caching helpers."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a fixed TTL.
+
+    Meant for small, slowly-changing lookups (pricing, model mappings, ...)
+    that are shared by all requests of a worker process. When full, the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key for the configured TTL."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                # Drop the least recently used entry to stay bounded
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class ShardedTTLCache:
+    """TTLCache split into independently locked shards.
+
+    Keys are spread over the shards by hash, so threads working on different
+    keys rarely contend for the same lock. Same interface as TTLCache;
+    maxsize is divided evenly between the shards.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024, shards: int = 32):
+        per_shard = max(1, maxsize // shards)
+        self._shards = [TTLCache(ttl_seconds, per_shard) for _ in range(shards)]
+
+    def _shard(self, key: Hashable) -> TTLCache:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        return self._shard(key).get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key for the configured TTL."""
+        self._shard(key).set(key, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        self._shard(key).pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for shard in self._shards:
+            shard.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
@@ -0,0 +1,31 @@
+"""Coarse wall clock for response timestamps."""
+import asyncio
+import time
+from typing import Optional
+
+# Refreshed by run_clock(); None when no ticker is running (scripts, tests)
+_now_seconds: Optional[int] = None
+
+
+def now_seconds() -> int:
+    """Current Unix time in whole seconds.
+
+    While run_clock() is running this is a cached value refreshed every
+    200 ms, so hot paths (one response object per streamed chunk) skip the
+    clock call; otherwise it reads the clock directly.
+    """
+    cached = _now_seconds
+    if cached is not None:
+        return cached
+    return time.time_ns() // 1_000_000_000
+
+
+async def run_clock(interval: float = 0.2) -> None:
+    """Keep the cached clock fresh until cancelled (started in lifespan)."""
+    global _now_seconds
+    try:
+        while True:
+            _now_seconds = time.time_ns() // 1_000_000_000
+            await asyncio.sleep(interval)
+    finally:
+        _now_seconds = None
@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     aws_access_key_id: Optional[str] = Field(default=None, alias="AWS_ACCESS_KEY_ID")
     aws_secret_access_key: Optional[str] = Field(default=None, alias="AWS_SECRET_ACCESS_KEY")
     bedrock_endpoint_url: Optional[str] = Field(default=None, alias="BEDROCK_ENDPOINT_URL")
+    # HTTP connections kept by the Bedrock client; each open stream holds one
+    bedrock_max_connections: int = Field(default=50, alias="BEDROCK_MAX_CONNECTIONS")
 
     # DynamoDB
     dynamodb_endpoint_url: Optional[str] = Field(default=None, alias="DYNAMODB_ENDPOINT_URL")
@@ -50,6 +52,28 @@ class Settings(BaseSettings):
     dynamodb_usage_stats_table: str = Field(
         default="openai-proxy-usage-stats", alias="DYNAMODB_USAGE_STATS_TABLE"
     )
+    dynamodb_usage_rollups_table: str = Field(
+        default="openai-proxy-usage-rollups", alias="DYNAMODB_USAGE_ROLLUPS_TABLE"
+    )
+    # HTTP connections kept by the shared DynamoDB client (botocore default is 10)
+    dynamodb_pool_size: int = Field(default=64, alias="DYNAMODB_POOL_SIZE")
+    # DynamoDB answers in milliseconds; fail fast and let adaptive retries kick in
+    dynamodb_connect_timeout: float = Field(default=1.0, alias="DYNAMODB_CONNECT_TIMEOUT")
+    dynamodb_read_timeout: float = Field(default=3.0, alias="DYNAMODB_READ_TIMEOUT")
+
+    # Usage tracking (records are queued and written in batches)
+    usage_queue_max_size: int = Field(default=10000, alias="USAGE_QUEUE_MAX_SIZE")
+    # How long the writer waits for a batch to fill before flushing it
+    usage_flush_interval_ms: int = Field(default=200, alias="USAGE_FLUSH_INTERVAL_MS")
+    # Aggregation only reads records older than this. Records are stamped
+    # when queued but land after the flush interval, write retries and clock
+    # skew between tasks; a record landing behind the watermark is never billed.
+    usage_settle_seconds: int = Field(default=30, alias="USAGE_SETTLE_SECONDS")
+    # "dynamodb" (default) or "firehose"; the admin portal only reads DynamoDB
+    usage_sink: str = Field(default="dynamodb", alias="USAGE_SINK")
+    usage_firehose_stream: Optional[str] = Field(default=None, alias="USAGE_FIREHOSE_STREAM")
+    # HTTP connections kept by the Firehose client (the writer sends one batch at a time)
+    usage_firehose_pool_size: int = Field(default=10, alias="USAGE_FIREHOSE_POOL_SIZE")
 
     # Authentication
     api_key_header: str = Field(default="x-api-key", alias="API_KEY_HEADER")
@@ -84,6 +108,13 @@ class Settings(BaseSettings):
     prompt_cache_min_tokens: int = Field(default=1024, alias="PROMPT_CACHE_MIN_TOKENS")
     default_cache_ttl: str = Field(default="5m", alias="DEFAULT_CACHE_TTL")
 
+    # In-process caches (seconds)
+    pricing_cache_ttl: int = Field(default=60, alias="PRICING_CACHE_TTL")
+    model_mapping_cache_ttl: int = Field(default=60, alias="MODEL_MAPPING_CACHE_TTL")
+    api_key_cache_ttl: int = Field(default=60, alias="API_KEY_CACHE_TTL")
+    api_key_negative_cache_ttl: int = Field(default=10, alias="API_KEY_NEGATIVE_CACHE_TTL")
+    api_key_cache_size: int = Field(default=10000, alias="API_KEY_CACHE_SIZE")
+
     # Timeouts
     bedrock_timeout: int = Field(default=300, alias="BEDROCK_TIMEOUT")
     streaming_timeout: int = Field(default=600, alias="STREAMING_TIMEOUT")
@@ -1,18 +1,24 @@
 """Database module."""
 from app.db.dynamodb import (
     DynamoDBClient,
+    get_dynamodb_client,
     APIKeyManager,
+    UsageRecord,
     UsageTracker,
     ModelMappingManager,
     ModelPricingManager,
     UsageStatsManager,
+    UsageRollupManager,
 )
 
 __all__ = [
     "DynamoDBClient",
+    "get_dynamodb_client",
     "APIKeyManager",
+    "UsageRecord",
     "UsageTracker",
     "ModelMappingManager",
     "ModelPricingManager",
     "UsageStatsManager",
+    "UsageRollupManager",
 ]
@@ -1,26 +1,286 @@
 """DynamoDB operations for API keys, usage tracking, model pricing, and usage stats."""
+import asyncio
 import json
+import secrets
+import threading
 import time
+import traceback
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
+from app.core.cache import ShardedTTLCache, TTLCache
 from app.core.config import settings
 
+# API keys are listed through a GSI partitioned on a constant entity type and
+# sorted by creation time, so admin listings never need a full-table Scan.
+API_KEY_ENTITY_TYPE = "api_key"
+API_KEY_ENTITY_INDEX = "EntityTypeIndex"
+
+# Issued keys are "sk-" followed by 32 lowercase hex digits
+API_KEY_PREFIX = "sk-"
+_API_KEY_LENGTH = len(API_KEY_PREFIX) + 32
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Usage records are bucketed by UTC day so time-window reads are Queries on
+# this GSI rather than Scans over the whole usage table.
+DAILY_USAGE_INDEX = "DailyUsageIndex"
+
+# Key-condition attributes, built once (Key objects are immutable)
+_KEY_API_KEY = Key("api_key")
+_KEY_TIMESTAMP = Key("timestamp")
+_KEY_DAY_BUCKET = Key("day_bucket")
+_KEY_ENTITY_TYPE = Key("entity_type")
+
+# Attributes _parse_key_info reads; auth fetches only these
+_KEY_INFO_PROJECTION = (
+    "api_key, user_id, #name, rate_limit, is_active, created_at, service_tier, cache_ttl"
+)
+
+# Attributes ModelPricingManager._to_prices reads (plus the key)
+_PRICE_PROJECTION = (
+    "model_id, input_price, output_price, cache_read_price, "
+    "cache_write_5m_price, cache_write_1h_price"
+)
+
+# Distinguishes "not cached" from a cached negative (None) lookup
+_CACHE_MISS = object()
+
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+
+def _unmarshal(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a low-level client item into native Python types."""
+    deserialize = _deserializer.deserialize
+    return {k: deserialize(v) for k, v in raw.items()}
+
+
+def _plain_number(text: str) -> Union[int, float]:
+    """Parse a low-level {"N": ...} string straight to int or float."""
+    if "." not in text and "E" not in text and "e" not in text:
+        return int(text)
+    value = Decimal(text)
+    return int(value) if value % 1 == 0 else float(value)
+
+
+def _unmarshal_plain(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a low-level client item into the plain types of _serialize_item.
+
+    Equivalent to _serialize_item(_unmarshal(raw)), but top-level strings,
+    numbers and booleans are converted directly from the wire format,
+    without a Decimal per number or TypeDeserializer dispatch per attribute.
+    """
+    result = {}
+    for key, attr in raw.items():
+        if "S" in attr:
+            result[key] = attr["S"]
+        elif "N" in attr:
+            result[key] = _plain_number(attr["N"])
+        elif "BOOL" in attr:
+            result[key] = attr["BOOL"]
+        else:
+            result[key] = _deserializer.deserialize(attr)
+    return result
+
+
+def _plain_decimal(value: Decimal) -> Union[int, float]:
+    """Integral Decimals become int, the rest float."""
+    integral = int(value)
+    return integral if integral == value else float(value)
+
+
+def _serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a resource-layer item to plain types (Decimal -> int or float)."""
+    # The resource layer only ever yields exact Decimals, so an identity
+    # type check stands in for isinstance
+    return {
+        key: _plain_decimal(value) if type(value) is Decimal else value
+        for key, value in item.items()
+    }
+
+
+@lru_cache(maxsize=8)
+def _day_bucket(epoch_day: int) -> str:
+    """Format a day number since the Unix epoch as the usage table's YYYY-MM-DD bucket."""
+    return time.strftime("%Y-%m-%d", time.gmtime(epoch_day * 86400))
+
+
+# (minute since the epoch, "YYYY-MM" of that minute); months start on a minute
+_month_cache = (-1, "")
+
+
+def _current_month() -> str:
+    """Current UTC month as "YYYY-MM" (budget_mtd_month), formatted once a minute."""
+    global _month_cache
+    minute = time.time_ns() // 60_000_000_000
+    cached_minute, month = _month_cache
+    if cached_minute != minute:
+        month = time.strftime("%Y-%m", time.gmtime(minute * 60))
+        _month_cache = (minute, month)
+    return month
+
+
+# Counter attributes of a usage_stats item, incremented with ADD
+_STATS_ATTRIBUTE_NAMES = {
+    "#input": "total_input_tokens",
+    "#output": "total_output_tokens",
+    "#cached": "total_cached_tokens",
+    "#cw5m": "total_cache_write_5m_tokens",
+    "#cw1h": "total_cache_write_1h_tokens",
+    "#requests": "total_requests",
+    "#cost": "total_cost",
+    "#updated": "updated_at",
+}
+
+# Usage record attributes read when aggregating stats and daily rollups
+_USAGE_AGGREGATE_PROJECTION = (
+    "#ts, model, day_bucket, prompt_tokens, completion_tokens, "
+    "cached_tokens, cache_write_tokens, cache_write_ttl"
+)
+
+# Cost math runs on integers: prices (USD per 1M tokens) are scaled to
+# nano-dollars, so tokens * price units / _COST_DIVISOR is the cost in USD
+_PRICE_SCALE = Decimal(1_000_000_000)
+_COST_DIVISOR = Decimal(1_000_000 * 1_000_000_000)
+
+
+@lru_cache(maxsize=1024)
+def _price_units(price: float) -> int:
+    """Per-1M-token price in nano-dollars (prices repeat across keys and runs)."""
+    return int((Decimal(str(price)) * _PRICE_SCALE).to_integral_value())
+
+
+def full_scan_segments() -> int:
+    """Segments for a whole-table parallel Scan: half the connection pool, at most 16."""
+    return max(1, min(settings.dynamodb_pool_size // 2, 16))
+
+
+def parallel_scan(
+    client,
+    table_name: str,
+    total_segments: int = 8,
+    unmarshal: Callable[[Dict[str, Any]], Dict[str, Any]] = _unmarshal,
+    **scan_kwargs,
+) -> List[Dict[str, Any]]:
+    """Read a whole table with a parallel segmented Scan.
+
+    Each segment is paginated to completion in its own worker thread using
+    the (thread-safe) low-level client. By default items are returned with
+    the same native types the resource API produces; pass
+    unmarshal=_unmarshal_plain for plain ints and floats instead.
+    """
+
+    def scan_segment(segment: int) -> List[Dict[str, Any]]:
+        kwargs = {
+            **scan_kwargs,
+            "TableName": table_name,
+            "TotalSegments": total_segments,
+            "Segment": segment,
+        }
+        items = []
+        while True:
+            response = client.scan(**kwargs)
+            items.extend(map(unmarshal, response.get("Items", [])))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            kwargs["ExclusiveStartKey"] = last_key
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        pages = list(executor.map(scan_segment, range(total_segments)))
+    return [item for page in pages for item in page]
+
+
+# Throttling and server-side failures: worth retrying later, never a "no"
+_RETRYABLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+})
+
+# ClientErrors seen by the managers, counted per error code
+_error_counts: Counter = Counter()
+_error_counts_lock = threading.Lock()
+
+
+def is_retryable_error(error: ClientError) -> bool:
+    """Whether a DynamoDB ClientError is throttling or a transient server failure."""
+    return error.response.get("Error", {}).get("Code") in _RETRYABLE_ERROR_CODES
+
+
+def _record_client_error(manager: str, action: str, error: ClientError) -> None:
+    """Count and log a ClientError that a manager is about to handle."""
+    code = error.response.get("Error", {}).get("Code", "Unknown")
+    with _error_counts_lock:
+        _error_counts[code] += 1
+    print(f"[{manager}] Error {action}: {code}: {error}")
+
+
+def get_error_counts() -> Dict[str, int]:
+    """Return the number of DynamoDB ClientErrors handled per error code."""
+    with _error_counts_lock:
+        return dict(_error_counts)
+
+
+# Scan calls per table, counted in non-production environments
+_scan_counts: Counter = Counter()
+_scan_counts_lock = threading.Lock()
+
+
+def get_scan_counts() -> Dict[str, int]:
+    """Return the number of Scan calls issued per table by this process."""
+    with _scan_counts_lock:
+        return dict(_scan_counts)
+
+
+def _warn_on_scan(params: Dict[str, Any], **kwargs) -> None:
+    """botocore before-parameter-build hook: surface every Scan and its caller."""
+    table_name = params.get("TableName", "?")
+    with _scan_counts_lock:
+        _scan_counts[table_name] += 1
+    caller = "?"
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        if "/botocore/" not in frame.filename and "/boto3/" not in frame.filename:
+            caller = f"{frame.filename}:{frame.lineno} in {frame.name}"
+            break
+    print(f"[DynamoDB] Warning: Scan on {table_name} from {caller}")
+
 
 class DynamoDBClient:
-    """DynamoDB client wrapper."""
+    """DynamoDB client wrapper.
+
+    Prefer get_dynamodb_client(): boto3 keeps a connection pool per client,
+    so sharing one instance lets every request reuse warm TLS connections.
+    """
+
+    # Instances built by this process, checked outside production
+    _instance_count = 0
+    _instance_count_lock = threading.Lock()
 
     def __init__(self):
+        if settings.environment not in ("prod", "production"):
+            self._warn_on_extra_instance()
+
         config = Config(
-            retries={"max_attempts": 3, "mode": "standard"},
-            connect_timeout=5,
-            read_timeout=10,
+            # Adaptive mode backs off client-side when a table throttles
+            retries={"max_attempts": 3, "mode": "adaptive"},
+            connect_timeout=settings.dynamodb_connect_timeout,
+            read_timeout=settings.dynamodb_read_timeout,
+            max_pool_connections=settings.dynamodb_pool_size,
+            tcp_keepalive=True,
         )
 
         client_kwargs = {
@@ -36,42 +296,222 @@ class DynamoDBClient:
             client_kwargs["aws_access_key_id"] = settings.aws_access_key_id
             client_kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
 
-        self.client = boto3.client(**client_kwargs)
-        self.resource = boto3.resource(**client_kwargs)
+        # One explicit session: service models, endpoints and credentials are
+        # loaded once for both objects, and the (not thread-safe) boto3
+        # default session is never touched from worker threads
+        self.session = boto3.session.Session()
+        self._client_kwargs = client_kwargs
+        self.client = self.session.client(**client_kwargs)
+        self._register_scan_warning(self.client)
+        self._tables: Dict[str, Any] = {}
+        self._tables_lock = threading.Lock()
+
+    @cached_property
+    def resource(self):
+        """boto3 resource API, built on first use (hot paths use self.client)."""
+        resource = self.session.resource(**self._client_kwargs)
+        self._register_scan_warning(resource.meta.client)
+        return resource
+
+    def table(self, table_name: str):
+        """Resource Table for table_name, built once and shared by all managers."""
+        table = self._tables.get(table_name)
+        if table is None:
+            with self._tables_lock:
+                table = self._tables.get(table_name)
+                if table is None:
+                    table = self._tables[table_name] = self.resource.Table(table_name)
+        return table
+
+    @classmethod
+    def _warn_on_extra_instance(cls) -> None:
+        """Flag clients built next to the shared one: each has its own pool."""
+        with cls._instance_count_lock:
+            cls._instance_count += 1
+            count = cls._instance_count
+        if count > 1:
+            caller = traceback.extract_stack()[-3]
+            print(
+                f"[DynamoDB] Warning: DynamoDBClient #{count} created at "
+                f"{caller.filename}:{caller.lineno}; use get_dynamodb_client()"
+            )
+
+    @staticmethod
+    def _register_scan_warning(client) -> None:
+        """Outside production, flag Scans so they get migrated to Queries."""
+        if settings.environment not in ("prod", "production"):
+            client.meta.events.register("before-parameter-build.dynamodb.Scan", _warn_on_scan)
+
+    def warmup(self) -> None:
+        """Prime credentials, the TLS context and pooled connections.
+
+        The first boto3 call pays for credential resolution and SSL setup;
+        doing it at startup keeps that off the first real request. Errors
+        are ignored: warmup must never block the app from starting.
+        """
+        table_names = (
+            settings.dynamodb_api_keys_table,
+            settings.dynamodb_usage_table,
+            settings.dynamodb_model_mapping_table,
+            settings.dynamodb_pricing_table,
+        )
+
+        def describe(table_name: str) -> None:
+            try:
+                self.client.describe_table(TableName=table_name)
+            except Exception as e:
+                print(f"[DynamoDB] Warmup of {table_name} failed: {e}")
+
+        with ThreadPoolExecutor(max_workers=len(table_names)) as executor:
+            list(executor.map(describe, table_names))
+
+
+@lru_cache(maxsize=1)
+def get_dynamodb_client() -> DynamoDBClient:
+    """Get the process-wide DynamoDB client."""
+    return DynamoDBClient()
 
 
 class APIKeyManager:
-    """Manage API keys in DynamoDB."""
+    """Manage API keys in DynamoDB.
+
+    validate_api_key results are cached per process: valid keys for
+    API_KEY_CACHE_TTL seconds, unknown or inactive keys for the shorter
+    API_KEY_NEGATIVE_CACHE_TTL. Writes through this class drop the key's
+    entries; writes from another process (the admin portal) take effect
+    once the entry expires.
+    """
+
+    # Sharded so concurrent validations of different keys don't share a lock
+    _valid_cache = ShardedTTLCache(
+        ttl_seconds=settings.api_key_cache_ttl, maxsize=settings.api_key_cache_size
+    )
+    _invalid_cache = ShardedTTLCache(
+        ttl_seconds=settings.api_key_negative_cache_ttl, maxsize=settings.api_key_cache_size
+    )
+
+    # Single-flight: concurrent cache misses for one key share one GetItem.
+    # The in-flight table is guarded by striped locks, picked by key hash.
+    _inflight: Dict[str, Future] = {}
+    _inflight_locks = tuple(threading.Lock() for _ in range(32))
+
+    @classmethod
+    def invalidate(cls, api_key: str) -> None:
+        """Drop cached validation results for api_key."""
+        cls._valid_cache.pop(api_key)
+        cls._invalid_cache.pop(api_key)
+
+    @staticmethod
+    def is_well_formed(api_key: str) -> bool:
+        """Whether api_key has the shape of a key issued by create_api_key."""
+        return (
+            len(api_key) == _API_KEY_LENGTH
+            and api_key.startswith(API_KEY_PREFIX)
+            and _HEX_DIGITS.issuperset(api_key[len(API_KEY_PREFIX):])
+        )
+
+    @classmethod
+    def get_cached_validation(cls, api_key: str, default: Any = None) -> Any:
+        """Return the cached key info, None for a cached invalid key, or default.
+
+        Malformed keys are rejected here without touching DynamoDB (or the
+        negative cache, which random probes would otherwise flood).
+        """
+        if not cls.is_well_formed(api_key):
+            return None
+        key_info = cls._valid_cache.get(api_key)
+        if key_info is not None:
+            return key_info
+        if cls._invalid_cache.get(api_key):
+            return None
+        return default
 
     def __init__(self, dynamodb_client: DynamoDBClient):
+        self.dynamodb_client = dynamodb_client
         self.client = dynamodb_client.client
-        self.resource = dynamodb_client.resource
         self.table_name = settings.dynamodb_api_keys_table
-        self.table = self.resource.Table(self.table_name)
+
+    @cached_property
+    def table(self):
+        """Resource Table, built only by the admin operations that use it."""
+        return self.dynamodb_client.table(self.table_name)
 
     def validate_api_key(self, api_key: str) -> Optional[Dict[str, Any]]:
         """Validate API key and return key info if valid."""
+        cached = self.get_cached_validation(api_key, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        inflight_lock = self._inflight_locks[hash(api_key) % len(self._inflight_locks)]
+        with inflight_lock:
+            future = self._inflight.get(api_key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[api_key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            key_info = self._load_key_info(api_key)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(key_info)
+        finally:
+            with inflight_lock:
+                self._inflight.pop(api_key, None)
+        return key_info
+
+    def _load_key_info(self, api_key: str) -> Optional[Dict[str, Any]]:
+        """Read the key from DynamoDB and cache the outcome."""
         try:
             response = self.client.get_item(
                 TableName=self.table_name,
-                Key={"api_key": {"S": api_key}},
+                Key={"api_key": _serializer.serialize(api_key)},
+                ProjectionExpression=_KEY_INFO_PROJECTION,
+                ExpressionAttributeNames={"#name": "name"},
+                ConsistentRead=False,
             )
-            item = response.get("Item")
-            if not item:
+        except ClientError as e:
+            _record_client_error("APIKeyManager", "validating key", e)
+            if is_retryable_error(e):
+                # Throttled even after botocore's retries: not an invalid key
+                raise
+            # Don't cache failures as "invalid key"
+            return None
+        except Exception as e:
+            print(f"[APIKeyManager] Error validating key: {e}")
+            return None
+
+        key_info = self._parse_key_info(response.get("Item"))
+        if key_info is None:
+            self._invalid_cache.set(api_key, True)
+        else:
+            self._valid_cache.set(api_key, key_info)
+        return key_info
+
+    @staticmethod
+    def _parse_key_info(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build the auth key info from a raw item, or None if unusable."""
+        try:
+            if not raw:
                 return None
 
-            is_active = item.get("is_active", {}).get("BOOL", True)
-            if not is_active:
+            item = _unmarshal(raw)
+            if not item.get("is_active", True):
                 return None
 
+            rate_limit = item.get("rate_limit")
+            created_at = item.get("created_at")
             return {
-                "api_key": item.get("api_key", {}).get("S"),
-                "user_id": item.get("user_id", {}).get("S"),
-                "name": item.get("name", {}).get("S"),
-                "rate_limit": int(item.get("rate_limit", {}).get("N", "100")),
-                "created_at": item.get("created_at", {}).get("S"),
-                "service_tier": item.get("service_tier", {}).get("S", "default"),
-                "cache_ttl": item.get("cache_ttl", {}).get("S", ""),
+                "api_key": item.get("api_key"),
+                "user_id": item.get("user_id"),
+                "name": item.get("name"),
+                "rate_limit": int(rate_limit) if rate_limit is not None else 100,
+                "created_at": int(created_at) if isinstance(created_at, Decimal) else created_at,
+                "service_tier": item.get("service_tier") or "default",
+                "cache_ttl": item.get("cache_ttl") or "",
             }
         except Exception:
             return None
@@ -88,11 +528,8 @@ class APIKeyManager:
         cache_ttl: Optional[str] = "",
     ) -> str:
         """Create a new API key. Returns the api_key string."""
-        api_key = f"sk-{uuid4().hex}"
-        now = int(time.time())
-
+        now = time.time_ns() // 1_000_000_000
         item = {
-            "api_key": api_key,
             "user_id": user_id,
             "name": name,
             "owner_name": owner_name or "",
@@ -100,17 +537,29 @@ class APIKeyManager:
             "monthly_budget": Decimal(str(monthly_budget or 0)),
             "budget_used": Decimal("0"),
             "budget_used_mtd": Decimal("0"),
-            "budget_mtd_month": datetime.now(timezone.utc).strftime("%Y-%m"),
+            "budget_mtd_month": _current_month(),
             "rate_limit": rate_limit or 100,
             "service_tier": service_tier or "default",
             "cache_ttl": cache_ttl or "",
             "is_active": True,
+            "entity_type": API_KEY_ENTITY_TYPE,
             "created_at": now,
             "updated_at": now,
         }
 
-        self.table.put_item(Item=item)
-        return api_key
+        for _ in range(3):
+            api_key = f"{API_KEY_PREFIX}{secrets.token_hex(16)}"
+            item["api_key"] = api_key
+            try:
+                # Never overwrite an existing key, however unlikely the collision
+                self.table.put_item(
+                    Item=item, ConditionExpression="attribute_not_exists(api_key)"
+                )
+                return api_key
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+        raise RuntimeError("Could not generate a unique API key")
 
     def get_api_key(self, api_key: str) -> Optional[Dict[str, Any]]:
         """Get full details of a specific API key."""
@@ -120,7 +569,11 @@ class APIKeyManager:
             if not item:
                 return None
             return self._serialize_item(item)
-        except Exception:
+        except ClientError as e:
+            _record_client_error("APIKeyManager", "getting key", e)
+            return None
+        except Exception as e:
+            print(f"[APIKeyManager] Error getting key: {e}")
             return None
 
     def list_all_api_keys(
@@ -129,30 +582,89 @@ class APIKeyManager:
         status_filter: Optional[str] = None,
         last_key: Optional[Dict] = None,
     ) -> Dict[str, Any]:
-        """List all API keys with optional filtering."""
+        """List API keys one page at a time with optional filtering.
+
+        Pages are read newest first with a Query on the entity_type GSI
+        (sorted by created_at), so each page costs O(limit). Tables that have
+        not been migrated yet (see scripts/migrate_api_keys_index.py) fall
+        back to a paginated Scan.
+
+        Raises ValueError if last_key is an index cursor but the listing has
+        to fall back to a Scan, which cannot resume from it.
+        """
         try:
-            scan_kwargs = {"Limit": limit}
+            page_kwargs: Dict[str, Any] = {}
             if last_key:
-                scan_kwargs["ExclusiveStartKey"] = last_key
-
-            response = self.table.scan(**scan_kwargs)
-            items = [self._serialize_item(item) for item in response.get("Items", [])]
+                page_kwargs["ExclusiveStartKey"] = last_key
+            # Filter server-side so non-matching keys never cross the wire
+            if status_filter == "active":
+                page_kwargs["FilterExpression"] = Attr("is_active").eq(True)
+            elif status_filter == "revoked":
+                page_kwargs["FilterExpression"] = (
+                    Attr("is_active").not_exists() | Attr("is_active").ne(True)
+                )
 
-            # Apply status filter
-            if status_filter:
-                if status_filter == "active":
-                    items = [i for i in items if i.get("is_active", False)]
-                elif status_filter == "revoked":
-                    items = [i for i in items if not i.get("is_active", False)]
+            use_index = True
+            items: List[Dict[str, Any]] = []
+            while True:
+                # Limit caps the items evaluated, not matched, so asking for
+                # the remainder never overshoots and last_key stays exact
+                page_kwargs["Limit"] = limit - len(items)
+                if use_index:
+                    try:
+                        response = self.table.query(
+                            IndexName=API_KEY_ENTITY_INDEX,
+                            KeyConditionExpression=_KEY_ENTITY_TYPE.eq(API_KEY_ENTITY_TYPE),
+                            ScanIndexForward=False,
+                            **page_kwargs,
+                        )
+                    except ClientError as e:
+                        if e.response.get("Error", {}).get("Code") != "ValidationException":
+                            raise
+                        use_index = False
+                        if "entity_type" in page_kwargs.get("ExclusiveStartKey", {}):
+                            # Scan rejects a GSI-shaped start key
+                            raise ValueError("Pagination cursor cannot be used with this table")
+                if not use_index:
+                    response = self.table.scan(**page_kwargs)
+
+                items.extend(self._serialize_item(item) for item in response.get("Items", []))
+                # Without a filter every evaluated item matches: one page suffices
+                if (
+                    "FilterExpression" not in page_kwargs
+                    or len(items) >= limit
+                    or "LastEvaluatedKey" not in response
+                ):
+                    break
+                page_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
             result = {"items": items}
             if "LastEvaluatedKey" in response:
                 result["last_key"] = response["LastEvaluatedKey"]
             return result
+        except ValueError:
+            raise
         except Exception as e:
             print(f"[APIKeyManager] Error listing keys: {e}")
             return {"items": []}
 
+    def scan_all_api_keys(self, total_segments: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return every API key, read with a parallel segmented Scan.
+
+        For whole-table consumers (dashboard totals, usage aggregation);
+        paginated listings use list_all_api_keys.
+        """
+        try:
+            return parallel_scan(
+                self.client,
+                self.table_name,
+                total_segments or full_scan_segments(),
+                unmarshal=_unmarshal_plain,
+            )
+        except Exception as e:
+            print(f"[APIKeyManager] Error scanning keys: {e}")
+            return []
+
     def update_api_key(self, api_key: str, **kwargs) -> bool:
         """Update fields on an API key."""
         try:
@@ -173,7 +685,7 @@ class APIKeyManager:
             # Always update updated_at
             update_parts.append("#updated_at = :updated_at")
             expr_names["#updated_at"] = "updated_at"
-            expr_values[":updated_at"] = int(time.time())
+            expr_values[":updated_at"] = time.time_ns() // 1_000_000_000
 
             self.table.update_item(
                 Key={"api_key": api_key},
@@ -181,6 +693,7 @@ class APIKeyManager:
                 ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values,
             )
+            self.invalidate(api_key)
             return True
         except Exception as e:
             print(f"[APIKeyManager] Error updating key: {e}")
@@ -203,9 +716,10 @@ class APIKeyManager:
                 },
                 ExpressionAttributeValues={
                     ":active": True,
-                    ":updated": int(time.time()),
+                    ":updated": time.time_ns() // 1_000_000_000,
                 },
             )
+            self.invalidate(api_key)
             return True
         except Exception as e:
             print(f"[APIKeyManager] Error reactivating key: {e}")
@@ -215,38 +729,148 @@ class APIKeyManager:
         """Permanently delete an API key."""
         try:
             self.table.delete_item(Key={"api_key": api_key})
+            self.invalidate(api_key)
             return True
         except Exception as e:
             print(f"[APIKeyManager] Error deleting key: {e}")
             return False
 
+    def add_budget_usage(
+        self, api_key: str, cost: Decimal, month: str
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically charge cost to a key's lifetime and month-to-date budget.
+
+        Counters are incremented server-side with ADD, so concurrent writers
+        never lose an update. The month-to-date counter restarts when month
+        differs from the stored budget_mtd_month. Returns the updated key, or
+        None if the key no longer exists.
+        """
+        same_month = {
+            "UpdateExpression": "ADD budget_used :c, budget_used_mtd :c SET budget_mtd_month = :mm",
+            "ConditionExpression": (
+                "attribute_exists(api_key) AND "
+                "(attribute_not_exists(budget_mtd_month) OR budget_mtd_month = :mm)"
+            ),
+        }
+        new_month = {
+            "UpdateExpression": "ADD budget_used :c SET budget_used_mtd = :c, budget_mtd_month = :mm",
+            "ConditionExpression": "attribute_exists(api_key) AND budget_mtd_month <> :mm",
+        }
+        # A key that is already on this month only takes the first path; the
+        # retry covers another writer rolling the month over in between
+        for update in (same_month, new_month, same_month):
+            try:
+                response = self.table.update_item(
+                    Key={"api_key": api_key},
+                    ExpressionAttributeValues={":c": cost, ":mm": month},
+                    ReturnValues="ALL_NEW",
+                    **update,
+                )
+                return self._serialize_item(response["Attributes"])
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+        return None
+
     def deactivate_for_budget_exceeded(self, api_key: str) -> bool:
         """Deactivate an API key because budget was exceeded."""
         return self.update_api_key(api_key, is_active=False, deactivated_reason="budget_exceeded")
 
-    def _serialize_item(self, item: Dict) -> Dict[str, Any]:
-        """Convert DynamoDB item (boto3 resource format) to plain dict."""
-        result = {}
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                # Convert Decimal to int or float
-                if value == int(value):
-                    result[key] = int(value)
-                else:
-                    result[key] = float(value)
-            else:
-                result[key] = value
-        return result
+    _serialize_item = staticmethod(_serialize_item)
+
+
+def _put_request_key(put_request: Dict[str, Any]) -> tuple:
+    """(api_key, timestamp) of a usage-table PutRequest."""
+    item = put_request["PutRequest"]["Item"]
+    return item["api_key"]["S"], int(item["timestamp"]["N"])
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    """One usage table item, queued until the writer flushes it."""
+
+    api_key: str
+    timestamp: int
+    request_id: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    success: bool
+    error_message: Optional[str]
+    latency_ms: Optional[int]
+    cached_tokens: int
+    cache_write_tokens: int
+    cache_write_ttl: Optional[str]
+
+    @classmethod
+    def create(
+        cls,
+        api_key: str,
+        request_id: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        success: bool = True,
+        error_message: Optional[str] = None,
+        latency_ms: Optional[int] = None,
+        cached_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        cache_write_ttl: Optional[str] = None,
+    ) -> "UsageRecord":
+        """Build the record for a request that finished now."""
+        return cls(
+            api_key, time.time_ns() // 1_000_000, request_id, model, prompt_tokens,
+            completion_tokens, success, error_message, latency_ms, cached_tokens,
+            cache_write_tokens, cache_write_ttl,
+        )
+
+    def to_item(self) -> Dict[str, Dict[str, Any]]:
+        """Marshal into a low-level client item (no TypeSerializer dispatch)."""
+        item = {
+            "api_key": {"S": self.api_key},
+            "timestamp": {"N": str(self.timestamp)},
+            "day_bucket": {"S": _day_bucket(self.timestamp // 86_400_000)},
+            "request_id": {"S": self.request_id},
+            "model": {"S": self.model},
+            "prompt_tokens": {"N": str(self.prompt_tokens)},
+            "completion_tokens": {"N": str(self.completion_tokens)},
+            "total_tokens": {"N": str(self.prompt_tokens + self.completion_tokens)},
+            "cached_tokens": {"N": str(self.cached_tokens)},
+            "cache_write_tokens": {"N": str(self.cache_write_tokens)},
+            "success": {"BOOL": self.success},
+        }
+
+        if self.cache_write_ttl:
+            item["cache_write_ttl"] = {"S": self.cache_write_ttl}
+        if self.error_message:
+            item["error_message"] = {"S": self.error_message}
+        if self.latency_ms:
+            item["latency_ms"] = {"N": str(self.latency_ms)}
+        return item
 
 
 class UsageTracker:
-    """Track API usage in DynamoDB."""
+    """Track API usage in DynamoDB.
 
-    def __init__(self, dynamodb_client: DynamoDBClient):
+    When constructed with a queue, record_usage only enqueues the record and
+    a background UsageWriter persists it with BatchWriteItem; otherwise each
+    record is written synchronously.
+    """
+
+    # BatchWriteItem accepts at most 25 put requests per call
+    BATCH_SIZE = 25
+    # Concurrent UpdateItem calls per flush_marks()
+    MARK_WORKERS = 8
+
+    def __init__(self, dynamodb_client: DynamoDBClient, queue: Optional[asyncio.Queue] = None):
         self.client = dynamodb_client.client
         self.resource = dynamodb_client.resource
         self.table_name = settings.dynamodb_usage_table
-        self.table = self.resource.Table(self.table_name)
+        self.table = dynamodb_client.table(self.table_name)
+        self.queue = queue
+        # Newest written usage timestamp per key, not yet marked
+        self._pending_marks: Dict[str, int] = {}
+        self._marks_lock = threading.Lock()
 
     def record_usage(
         self,
@@ -262,75 +886,228 @@ class UsageTracker:
         cache_write_tokens: int = 0,
         cache_write_ttl: Optional[str] = None,
     ):
-        """Record API usage."""
+        """Record API usage.
+
+        With a queue this never blocks: the record is enqueued for the
+        background writer. Must be called from the event loop thread, since
+        asyncio.Queue is not thread-safe.
+        """
         try:
-            timestamp = int(time.time() * 1000)
-            item = {
-                "api_key": api_key,
-                "timestamp": timestamp,
-                "request_id": request_id,
-                "model": model,
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": prompt_tokens + completion_tokens,
-                "cached_tokens": cached_tokens,
-                "cache_write_tokens": cache_write_tokens,
-                "success": success,
-            }
+            record = UsageRecord.create(
+                api_key, request_id, model, prompt_tokens, completion_tokens, success,
+                error_message, latency_ms, cached_tokens, cache_write_tokens, cache_write_ttl,
+            )
+            if self.queue is not None:
+                self._enqueue(record)
+                return
+
+            self.client.put_item(TableName=self.table_name, Item=record.to_item())
+            self.mark_latest_usage(record.api_key, record.timestamp)
+        except ClientError as e:
+            # Don't fail request on usage tracking error
+            _record_client_error("UsageTracker", "recording usage", e)
+        except Exception as e:
+            print(f"[UsageTracker] Error recording usage: {e}")
 
-            if cache_write_ttl:
-                item["cache_write_ttl"] = cache_write_ttl
-            if error_message:
-                item["error_message"] = error_message
-            if latency_ms:
-                item["latency_ms"] = latency_ms
+    def _enqueue(self, record: "UsageRecord") -> None:
+        """Queue record for the background writer, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            print(f"[UsageTracker] Usage queue full, dropping record {record.request_id}")
 
-            self.table.put_item(Item=item)
-        except Exception:
-            pass  # Don't fail request on usage tracking error
+    def write_batch(self, records: List["UsageRecord"], max_attempts: int = 5) -> int:
+        """Write up to BATCH_SIZE usage records with one BatchWriteItem call.
+
+        Unprocessed items are retried with exponential backoff. Returns the
+        number of records that could not be written.
+        """
+        self._make_keys_unique(records)
+        request = {
+            self.table_name: [{"PutRequest": {"Item": record.to_item()}} for record in records]
+        }
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(min(0.05 * 2 ** attempt, 2.0))
+            try:
+                response = self.client.batch_write_item(RequestItems=request)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ValidationException":
+                    raise
+                # One bad item fails the whole call; write the rest one by one
+                _record_client_error("UsageTracker", "batch writing usage", e)
+                failed = self._put_each(request[self.table_name])
+                break
+            request = response.get("UnprocessedItems") or {}
+            if not request:
+                failed = set()
+                break
+        else:
+            failed = {_put_request_key(put) for put in request.get(self.table_name, [])}
+
+        # Only records that were actually written advance the marker
+        self.note_latest_usage(
+            [record for record in records if (record.api_key, record.timestamp) not in failed]
+        )
+        return len(failed)
+
+    @staticmethod
+    def _make_keys_unique(records: List["UsageRecord"]) -> None:
+        """Move records that share an (api_key, timestamp) key apart by 1 ms.
+
+        BatchWriteItem rejects the whole call when two puts have the same
+        key, which happens whenever one key finishes two requests within
+        the same millisecond.
+        """
+        seen = set()
+        for record in records:
+            while (record.api_key, record.timestamp) in seen:
+                record.timestamp += 1
+            seen.add((record.api_key, record.timestamp))
+
+    def _put_each(self, put_requests: List[Dict[str, Any]]) -> set:
+        """Write put requests individually; returns the keys that failed."""
+        failed = set()
+        for put_request in put_requests:
+            try:
+                self.client.put_item(TableName=self.table_name, Item=put_request["PutRequest"]["Item"])
+            except ClientError as e:
+                _record_client_error("UsageTracker", "writing usage", e)
+                failed.add(_put_request_key(put_request))
+        return failed
+
+    def note_latest_usage(self, records: List["UsageRecord"]) -> None:
+        """Remember each key's newest written usage for the next flush_marks()."""
+        with self._marks_lock:
+            pending = self._pending_marks
+            for record in records:
+                if record.timestamp > pending.get(record.api_key, 0):
+                    pending[record.api_key] = record.timestamp
+
+    def flush_marks(self) -> None:
+        """Write the noted markers, at most one UpdateItem per key.
+
+        Called periodically by UsageWriter, so markers cost one update per
+        active key per interval instead of one per written batch, and the
+        updates run concurrently rather than on the batch drain path.
+        """
+        with self._marks_lock:
+            pending, self._pending_marks = self._pending_marks, {}
+        if len(pending) <= 1:
+            for api_key, timestamp in pending.items():
+                self.mark_latest_usage(api_key, timestamp)
+            return
+        with ThreadPoolExecutor(max_workers=min(len(pending), self.MARK_WORKERS)) as executor:
+            list(executor.map(self.mark_latest_usage, pending.keys(), pending.values()))
+
+    def mark_latest_usage(self, api_key: str, timestamp: int) -> None:
+        """Record a key's newest usage timestamp on its usage_stats item.
+
+        Runs after the records are written. The aggregator compares it with
+        last_aggregated_timestamp to skip keys that have no new records
+        without querying the usage table. The condition keeps the marker
+        from moving backwards when writers race.
+        """
+        try:
+            self.client.update_item(
+                TableName=settings.dynamodb_usage_stats_table,
+                Key={"api_key": {"S": api_key}},
+                UpdateExpression="SET #last_event = :ts",
+                ConditionExpression="attribute_not_exists(#last_event) OR #last_event < :ts",
+                ExpressionAttributeNames={"#last_event": "last_event_timestamp"},
+                ExpressionAttributeValues={":ts": {"N": str(timestamp)}},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                print(f"[UsageTracker] Error marking usage for {api_key}: {e}")
+        except Exception as e:
+            print(f"[UsageTracker] Error marking usage for {api_key}: {e}")
+
+    def query_day(
+        self,
+        day_bucket: str,
+        start_ms: int,
+        end_ms: int,
+        projection: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return all usage records of one UTC day within [start_ms, end_ms].
+
+        Reads the DailyUsageIndex GSI page by page, so the cost is bounded by
+        the records in that day rather than the size of the usage table. The
+        index projects only the keys and model, so those are all a record has.
+        """
+        query_kwargs = {
+            "IndexName": DAILY_USAGE_INDEX,
+            "KeyConditionExpression": _KEY_DAY_BUCKET.eq(day_bucket)
+            & _KEY_TIMESTAMP.between(start_ms, end_ms),
+            "Limit": 1000,
+        }
+        if projection:
+            query_kwargs["ProjectionExpression"] = projection
+
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            query_kwargs["ExclusiveStartKey"] = last_key
 
     def get_usage_stats(self, api_key: str, days: int = 30) -> Dict[str, Any]:
         """Get usage statistics for an API key from the usage table."""
         try:
             # Calculate timestamp for N days ago
-            cutoff = int((time.time() - days * 86400) * 1000)
+            cutoff = time.time_ns() // 1_000_000 - days * 86_400_000
 
             response = self.table.query(
-                KeyConditionExpression=Key("api_key").eq(api_key) & Key("timestamp").gte(cutoff),
+                KeyConditionExpression=_KEY_API_KEY.eq(api_key) & _KEY_TIMESTAMP.gte(cutoff),
             )
 
             items = response.get("Items", [])
-            total_input = sum(int(i.get("prompt_tokens", 0)) for i in items)
-            total_output = sum(int(i.get("completion_tokens", 0)) for i in items)
-            total_cached = sum(int(i.get("cached_tokens", 0)) for i in items)
-            total_cache_write_5m = sum(
-                int(i.get("cache_write_tokens", 0)) for i in items if (i.get("cache_write_ttl") or "5m") != "1h"
-            )
-            total_cache_write_1h = sum(
-                int(i.get("cache_write_tokens", 0)) for i in items if i.get("cache_write_ttl") == "1h"
-            )
-            total_requests = len(items)
-            successful = sum(1 for i in items if i.get("success", True))
 
-            # Group by model
-            model_usage = {}
+            # Single pass over the records; flat (kind, model, metric) keys
+            # avoid the nested per-model dict lookups on every row.
+            agg = defaultdict(int)
+            models = set()
             for item in items:
+                prompt = int(item.get("prompt_tokens", 0))
+                completion = int(item.get("completion_tokens", 0))
+                agg["input"] += prompt
+                agg["output"] += completion
+                agg["cached"] += int(item.get("cached_tokens", 0))
+                if item.get("cache_write_ttl") == "1h":
+                    agg["cache_write_1h"] += int(item.get("cache_write_tokens", 0))
+                else:
+                    agg["cache_write_5m"] += int(item.get("cache_write_tokens", 0))
+                if item.get("success", True):
+                    agg["successful"] += 1
+
                 model = item.get("model", "unknown")
-                if model not in model_usage:
-                    model_usage[model] = {"requests": 0, "input_tokens": 0, "output_tokens": 0}
-                model_usage[model]["requests"] += 1
-                model_usage[model]["input_tokens"] += int(item.get("prompt_tokens", 0))
-                model_usage[model]["output_tokens"] += int(item.get("completion_tokens", 0))
+                models.add(model)
+                agg[("m", model, "requests")] += 1
+                agg[("m", model, "input_tokens")] += prompt
+                agg[("m", model, "output_tokens")] += completion
+
+            total_requests = len(items)
+            model_usage = {
+                model: {
+                    "requests": agg[("m", model, "requests")],
+                    "input_tokens": agg[("m", model, "input_tokens")],
+                    "output_tokens": agg[("m", model, "output_tokens")],
+                }
+                for model in models
+            }
 
             return {
-                "total_input_tokens": total_input,
-                "total_output_tokens": total_output,
-                "total_cached_tokens": total_cached,
-                "total_cache_write_5m_tokens": total_cache_write_5m,
-                "total_cache_write_1h_tokens": total_cache_write_1h,
+                "total_input_tokens": agg["input"],
+                "total_output_tokens": agg["output"],
+                "total_cached_tokens": agg["cached"],
+                "total_cache_write_5m_tokens": agg["cache_write_5m"],
+                "total_cache_write_1h_tokens": agg["cache_write_1h"],
                 "total_requests": total_requests,
-                "successful_requests": successful,
-                "failed_requests": total_requests - successful,
+                "successful_requests": agg["successful"],
+                "failed_requests": total_requests - agg["successful"],
                 "model_usage": model_usage,
                 "period_days": days,
             }
@@ -351,52 +1128,154 @@ class UsageTracker:
 
 
 class ModelMappingManager:
-    """Manage model ID mappings in DynamoDB."""
+    """Manage model ID mappings in DynamoDB.
+
+    The table is small and rarely written, so each process keeps a snapshot
+    of the whole table, reloaded with one Scan every MODEL_MAPPING_CACHE_TTL
+    seconds. Writes through this class update the snapshot in place.
+    """
+
+    _snapshot: Optional[Dict[str, str]] = None
+    _snapshot_expires_at = 0.0
+    _snapshot_lock = threading.Lock()
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Force the next lookup to reload the snapshot."""
+        with cls._snapshot_lock:
+            cls._snapshot_expires_at = 0.0
+
+    @classmethod
+    def snapshot_is_fresh(cls) -> bool:
+        """Whether lookups can be answered without a DynamoDB round trip."""
+        return cls._snapshot is not None and cls._snapshot_expires_at > time.monotonic()
+
+    @classmethod
+    def get_cached_mapping(cls, openai_model_id: str, default: Any = None) -> Any:
+        """Return the mapping for openai_model_id (may be None) from a fresh
+        snapshot, or default if the snapshot needs reloading."""
+        if not cls.snapshot_is_fresh():
+            return default
+        return cls._snapshot.get(openai_model_id)
 
     def __init__(self, dynamodb_client: DynamoDBClient):
+        self.dynamodb_client = dynamodb_client
         self.client = dynamodb_client.client
-        self.resource = dynamodb_client.resource
         self.table_name = settings.dynamodb_model_mapping_table
-        self.table = self.resource.Table(self.table_name)
+
+    @cached_property
+    def table(self):
+        """Resource Table, built only by the admin operations that use it."""
+        return self.dynamodb_client.table(self.table_name)
+
+    def load_snapshot(self) -> Optional[Dict[str, str]]:
+        """Return the mapping snapshot, reloading it from DynamoDB if stale."""
+        cls = type(self)
+        if cls.snapshot_is_fresh():
+            return cls._snapshot
+
+        with cls._snapshot_lock:
+            # Another thread may have reloaded while we waited for the lock
+            if cls.snapshot_is_fresh():
+                return cls._snapshot
+            try:
+                items = parallel_scan(
+                    self.client,
+                    self.table_name,
+                    total_segments=4,
+                    ProjectionExpression="openai_model_id, bedrock_model_id",
+                    ConsistentRead=False,
+                )
+            except Exception as e:
+                print(f"[ModelMappingManager] Error loading mappings: {e}")
+                if cls._snapshot is not None:
+                    # Keep serving the last good snapshot rather than retrying per request
+                    cls._snapshot_expires_at = time.monotonic() + settings.model_mapping_cache_ttl
+                return cls._snapshot
+
+            cls._snapshot = {
+                item["openai_model_id"]: item["bedrock_model_id"]
+                for item in items
+                if item.get("openai_model_id") and item.get("bedrock_model_id")
+            }
+            cls._snapshot_expires_at = time.monotonic() + settings.model_mapping_cache_ttl
+            return cls._snapshot
+
+    def _update_snapshot(self, openai_model_id: str, bedrock_model_id: Optional[str]) -> None:
+        """Apply a write to the in-process snapshot."""
+        cls = type(self)
+        with cls._snapshot_lock:
+            if cls._snapshot is None:
+                return
+            snapshot = dict(cls._snapshot)
+            if bedrock_model_id is None:
+                snapshot.pop(openai_model_id, None)
+            else:
+                snapshot[openai_model_id] = bedrock_model_id
+            cls._snapshot = snapshot
 
     def get_mapping(self, openai_model_id: str) -> Optional[str]:
         """Get Bedrock model ID for OpenAI/Anthropic model ID."""
+        snapshot = self.load_snapshot()
+        if snapshot is None:
+            return None
+        return snapshot.get(openai_model_id)
+
+    def set_mapping(
+        self,
+        openai_model_id: str,
+        bedrock_model_id: str,
+        must_exist: Optional[bool] = None,
+    ) -> bool:
+        """Set model ID mapping.
+
+        must_exist=False only creates a new mapping and must_exist=True only
+        replaces an existing one, enforced by the write itself (no read
+        first). Returns False if that condition did not hold.
+        """
+        put_kwargs: Dict[str, Any] = {}
+        if must_exist is True:
+            put_kwargs["ConditionExpression"] = "attribute_exists(openai_model_id)"
+        elif must_exist is False:
+            put_kwargs["ConditionExpression"] = "attribute_not_exists(openai_model_id)"
         try:
-            response = self.client.get_item(
+            self.client.put_item(
                 TableName=self.table_name,
-                Key={"openai_model_id": {"S": openai_model_id}},
+                Item={
+                    k: _serializer.serialize(v)
+                    for k, v in {
+                        "openai_model_id": openai_model_id,
+                        "bedrock_model_id": bedrock_model_id,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    }.items()
+                },
+                **put_kwargs,
             )
-            item = response.get("Item")
-            if item:
-                return item.get("bedrock_model_id", {}).get("S")
-        except Exception:
-            pass
-        return None
-
-    def set_mapping(self, openai_model_id: str, bedrock_model_id: str):
-        """Set model ID mapping."""
-        self.client.put_item(
-            TableName=self.table_name,
-            Item={
-                "openai_model_id": {"S": openai_model_id},
-                "bedrock_model_id": {"S": bedrock_model_id},
-                "updated_at": {"S": datetime.now(timezone.utc).isoformat()},
-            },
-        )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            return False
+        self._update_snapshot(openai_model_id, bedrock_model_id)
+        return True
 
-    def list_mappings(self) -> List[Dict[str, Any]]:
+    def list_mappings(self, total_segments: int = 4) -> List[Dict[str, Any]]:
         """List all model mappings. Returns anthropic_model_id for admin portal compatibility.
 
-        updated_at is returned as a Unix timestamp (int) parsed from the stored
-        ISO-8601 string.
+        The whole table is read with a parallel segmented Scan (every page,
+        projected to the attributes returned here). updated_at is returned as
+        a Unix timestamp (int) parsed from the stored ISO-8601 string.
         """
         try:
-            response = self.client.scan(TableName=self.table_name)
+            items = parallel_scan(
+                self.client,
+                self.table_name,
+                total_segments,
+                ProjectionExpression="openai_model_id, bedrock_model_id, updated_at",
+            )
             mappings = []
-            for item in response.get("Items", []):
-                openai_id = item.get("openai_model_id", {}).get("S", "")
-                bedrock_id = item.get("bedrock_model_id", {}).get("S", "")
-                updated_at_str = item.get("updated_at", {}).get("S")
+            for item in items:
+                openai_id = item.get("openai_model_id", "")
+                updated_at_str = item.get("updated_at")
                 updated_at_ts: Optional[int] = None
                 if updated_at_str:
                     try:
@@ -406,11 +1285,12 @@ class ModelMappingManager:
                 mappings.append({
                     "openai_model_id": openai_id,
                     "anthropic_model_id": openai_id,  # Alias for admin portal
-                    "bedrock_model_id": bedrock_id,
+                    "bedrock_model_id": item.get("bedrock_model_id", ""),
                     "updated_at": updated_at_ts,
                 })
             return mappings
-        except Exception:
+        except Exception as e:
+            print(f"[ModelMappingManager] Error listing mappings: {e}")
             return []
 
     def delete_mapping(self, openai_model_id: str) -> bool:
@@ -418,8 +1298,9 @@ class ModelMappingManager:
         try:
             self.client.delete_item(
                 TableName=self.table_name,
-                Key={"openai_model_id": {"S": openai_model_id}},
+                Key={"openai_model_id": _serializer.serialize(openai_model_id)},
             )
+            self._update_snapshot(openai_model_id, None)
             return True
         except Exception as e:
             print(f"[ModelMappingManager] Error deleting mapping: {e}")
@@ -427,13 +1308,26 @@ class ModelMappingManager:
 
 
 class ModelPricingManager:
-    """Manage model pricing in DynamoDB."""
+    """Manage model pricing in DynamoDB.
+
+    Pricing changes rarely, so listings and per-model price lookups are cached
+    per process for PRICING_CACHE_TTL seconds and dropped on any write.
+    """
+
+    _list_cache = TTLCache(ttl_seconds=settings.pricing_cache_ttl, maxsize=256)
+    _price_cache = TTLCache(ttl_seconds=settings.pricing_cache_ttl, maxsize=1024)
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drop cached pricing after a write."""
+        cls._list_cache.clear()
+        cls._price_cache.clear()
 
     def __init__(self, dynamodb_client: DynamoDBClient):
         self.client = dynamodb_client.client
         self.resource = dynamodb_client.resource
         self.table_name = settings.dynamodb_pricing_table
-        self.table = self.resource.Table(self.table_name)
+        self.table = dynamodb_client.table(self.table_name)
 
     def get_pricing(self, model_id: str) -> Optional[Dict[str, Any]]:
         """Get pricing for a specific model."""
@@ -460,7 +1354,7 @@ class ModelPricingManager:
         status: str = "active",
     ) -> Dict[str, Any]:
         """Create a new model pricing entry."""
-        now = int(time.time())
+        now = time.time_ns() // 1_000_000_000
         item = {
             "model_id": model_id,
             "provider": provider,
@@ -480,6 +1374,7 @@ class ModelPricingManager:
             item["cache_write_1h_price"] = Decimal(str(cache_write_1h_price))
 
         self.table.put_item(Item=item)
+        self.invalidate_cache()
         return self._serialize_item(item)
 
     def update_pricing(self, model_id: str, **kwargs) -> bool:
@@ -501,7 +1396,7 @@ class ModelPricingManager:
 
             update_parts.append("#updated_at = :updated_at")
             expr_names["#updated_at"] = "updated_at"
-            expr_values[":updated_at"] = int(time.time())
+            expr_values[":updated_at"] = time.time_ns() // 1_000_000_000
 
             self.table.update_item(
                 Key={"model_id": model_id},
@@ -509,6 +1404,7 @@ class ModelPricingManager:
                 ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values,
             )
+            self.invalidate_cache()
             return True
         except Exception as e:
             print(f"[ModelPricingManager] Error updating pricing: {e}")
@@ -518,6 +1414,7 @@ class ModelPricingManager:
         """Delete a model pricing entry."""
         try:
             self.table.delete_item(Key={"model_id": model_id})
+            self.invalidate_cache()
             return True
         except Exception as e:
             print(f"[ModelPricingManager] Error deleting pricing: {e}")
@@ -529,34 +1426,77 @@ class ModelPricingManager:
         provider_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
         last_key: Optional[Dict] = None,
+        full: bool = False,
     ) -> Dict[str, Any]:
-        """List all model pricing entries."""
-        try:
-            scan_kwargs = {"Limit": limit}
-            if last_key:
-                scan_kwargs["ExclusiveStartKey"] = last_key
+        """List all model pricing entries.
 
-            response = self.table.scan(**scan_kwargs)
-            items = [self._serialize_item(item) for item in response.get("Items", [])]
+        With full=True the whole table is read with a parallel segmented
+        Scan (limit and last_key are ignored and no last_key is returned);
+        meant for whole-table consumers such as the dashboard, not per request.
+        """
+        cache_key = (
+            limit,
+            provider_filter,
+            status_filter,
+            tuple(sorted(last_key.items())) if last_key else None,
+            full,
+        )
+        cached = self._list_cache.get(cache_key)
+        if cached is not None:
+            return self._copy_listing(cached)
 
+        try:
+            filter_kwargs = {}
+            if status_filter:
+                filter_kwargs = {
+                    "FilterExpression": "#status = :status",
+                    "ExpressionAttributeNames": {"#status": "status"},
+                    "ExpressionAttributeValues": {":status": {"S": status_filter}},
+                }
+
+            if full:
+                response: Dict[str, Any] = {}
+                items = parallel_scan(
+                    self.client,
+                    self.table_name,
+                    full_scan_segments(),
+                    unmarshal=_unmarshal_plain,
+                    **filter_kwargs,
+                )
+            else:
+                # Low-level scan: pages are converted to plain types in one pass
+                scan_kwargs = {"TableName": self.table_name, "Limit": limit, **filter_kwargs}
+                if last_key:
+                    scan_kwargs["ExclusiveStartKey"] = {
+                        k: _serializer.serialize(v) for k, v in last_key.items()
+                    }
+                response = self.client.scan(**scan_kwargs)
+                items = [_unmarshal_plain(raw) for raw in response.get("Items", [])]
+
+            # Provider matching is case-insensitive, which DynamoDB filters can't express
             if provider_filter:
                 items = [i for i in items if i.get("provider", "").lower() == provider_filter.lower()]
-            if status_filter:
-                items = [i for i in items if i.get("status", "") == status_filter]
 
             result = {"items": items}
             if "LastEvaluatedKey" in response:
-                result["last_key"] = response["LastEvaluatedKey"]
-            return result
+                result["last_key"] = _unmarshal(response["LastEvaluatedKey"])
+            self._list_cache.set(cache_key, result)
+            return self._copy_listing(result)
         except Exception as e:
             print(f"[ModelPricingManager] Error listing pricing: {e}")
             return {"items": []}
 
-    def get_price_for_model(self, model_id: str) -> Optional[Dict[str, float]]:
-        """Get input/output prices for cost calculation."""
-        pricing = self.get_pricing(model_id)
-        if not pricing:
-            return None
+    @staticmethod
+    def _copy_listing(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached listing, so callers editing items can't corrupt the cache."""
+        copy = {"items": [dict(item) for item in result["items"]]}
+        if "last_key" in result:
+            copy["last_key"] = dict(result["last_key"])
+        return copy
+
+    @staticmethod
+    def _to_prices(pricing: Dict[str, Any]) -> Dict[str, float]:
+        """Extract the per-1M-token prices used for cost calculation."""
         return {
             "input_price": float(pricing.get("input_price", 0)),
             "output_price": float(pricing.get("output_price", 0)),
@@ -565,6 +1505,75 @@ class ModelPricingManager:
             "cache_write_1h_price": float(pricing.get("cache_write_1h_price", 0) or 0),
         }
 
+    def get_price_for_model(self, model_id: str) -> Optional[Dict[str, float]]:
+        """Get input/output prices for cost calculation."""
+        cached = self._price_cache.get(model_id, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            # Cached price dicts are shared; callers get their own copy
+            return dict(cached) if cached else None
+
+        try:
+            pricing = self.table.get_item(
+                Key={"model_id": model_id}, ProjectionExpression=_PRICE_PROJECTION
+            ).get("Item")
+        except Exception as e:
+            # Don't cache transient failures as "no pricing"
+            print(f"[ModelPricingManager] Error getting pricing: {e}")
+            return None
+
+        prices = self._to_prices(pricing) if pricing else None
+        self._price_cache.set(model_id, prices)
+        return dict(prices) if prices else None
+
+    def get_prices_for_models(self, model_ids) -> Dict[str, Optional[Dict[str, float]]]:
+        """Get prices for several models with BatchGetItem point reads.
+
+        Returns a mapping for every requested model id; models without
+        pricing map to None. Cached entries are not re-read.
+        """
+        prices: Dict[str, Optional[Dict[str, float]]] = {}
+        missing = []
+        for model_id in set(model_ids):
+            if not model_id:
+                continue
+            cached = self._price_cache.get(model_id, _CACHE_MISS)
+            if cached is _CACHE_MISS:
+                missing.append(model_id)
+            else:
+                prices[model_id] = dict(cached) if cached else None
+
+        try:
+            for start in range(0, len(missing), 100):
+                chunk = missing[start:start + 100]
+                request = {
+                    self.table_name: {
+                        "Keys": [{"model_id": m} for m in chunk],
+                        "ProjectionExpression": _PRICE_PROJECTION,
+                    }
+                }
+                found = {}
+                attempt = 0
+                while request:
+                    if attempt:
+                        time.sleep(min(0.05 * 2 ** attempt, 1.0))
+                    response = self.resource.batch_get_item(RequestItems=request)
+                    for item in response.get("Responses", {}).get(self.table_name, []):
+                        found[item["model_id"]] = self._to_prices(item)
+                    request = response.get("UnprocessedKeys") or None
+                    attempt += 1
+                for model_id in chunk:
+                    price = found.get(model_id)
+                    self._price_cache.set(model_id, price)
+                    prices[model_id] = dict(price) if price else None
+        except Exception as e:
+            # Fall back to per-model lookups for whatever is still missing
+            print(f"[ModelPricingManager] Error batch getting pricing: {e}")
+            for model_id in missing:
+                if model_id not in prices:
+                    prices[model_id] = self.get_price_for_model(model_id)
+
+        return prices
+
     def seed_default_pricing(self) -> None:
         """Seed default model pricing if the table is empty."""
         try:
@@ -573,7 +1582,7 @@ class ModelPricingManager:
                 return
 
             from scripts.seed_pricing import DEFAULT_PRICING
-            now = int(time.time())
+            now = time.time_ns() // 1_000_000_000
             for model in DEFAULT_PRICING:
                 item = {
                     "model_id": model["model_id"],
@@ -589,22 +1598,12 @@ class ModelPricingManager:
                     if model.get(field) is not None:
                         item[field] = Decimal(str(model[field]))
                 self.table.put_item(Item=item)
+            self.invalidate_cache()
             print(f"[ModelPricingManager] Seeded {len(DEFAULT_PRICING)} default pricing entries")
         except Exception as e:
             print(f"[ModelPricingManager] Warning: Could not seed default pricing: {e}")
 
-    def _serialize_item(self, item: Dict) -> Dict[str, Any]:
-        """Convert DynamoDB item to plain dict."""
-        result = {}
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                if value == int(value):
-                    result[key] = int(value)
-                else:
-                    result[key] = float(value)
-            else:
-                result[key] = value
-        return result
+    _serialize_item = staticmethod(_serialize_item)
 
 
 class UsageStatsManager:
@@ -614,7 +1613,7 @@ class UsageStatsManager:
         self.client = dynamodb_client.client
         self.resource = dynamodb_client.resource
         self.table_name = settings.dynamodb_usage_stats_table
-        self.table = self.resource.Table(self.table_name)
+        self.table = dynamodb_client.table(self.table_name)
 
     def get_stats(self, api_key: str) -> Optional[Dict[str, Any]]:
         """Get aggregated usage stats for an API key."""
@@ -628,6 +1627,32 @@ class UsageStatsManager:
             print(f"[UsageStatsManager] Error getting stats: {e}")
             return None
 
+    def get_stats_batch(
+        self, api_keys: List[str], projection: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Batch-get the stats items of the given keys (100 per request), keyed by api_key.
+
+        Keys without a stats item are absent from the result.
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(api_keys), 100):
+            table_request: Dict[str, Any] = {
+                "Keys": [{"api_key": k} for k in api_keys[start:start + 100]],
+            }
+            if projection:
+                table_request["ProjectionExpression"] = projection
+            request = {self.table_name: table_request}
+            attempt = 0
+            while request:
+                if attempt:
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+                response = self.resource.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    result[item["api_key"]] = self._serialize_item(item)
+                request = response.get("UnprocessedKeys") or None
+                attempt += 1
+        return result
+
     def update_stats(
         self,
         api_key: str,
@@ -641,200 +1666,434 @@ class UsageStatsManager:
     ) -> bool:
         """Update (increment) aggregated stats for an API key."""
         try:
-            self.table.update_item(
-                Key={"api_key": api_key},
-                UpdateExpression=(
-                    "ADD #input :input, #output :output, #cached :cached, "
-                    "#cw5m :cw5m, #cw1h :cw1h, #requests :requests, #cost :cost "
-                    "SET #updated = :updated"
-                ),
-                ExpressionAttributeNames={
-                    "#input": "total_input_tokens",
-                    "#output": "total_output_tokens",
-                    "#cached": "total_cached_tokens",
-                    "#cw5m": "total_cache_write_5m_tokens",
-                    "#cw1h": "total_cache_write_1h_tokens",
-                    "#requests": "total_requests",
-                    "#cost": "total_cost",
-                    "#updated": "updated_at",
-                },
-                ExpressionAttributeValues={
-                    ":input": input_tokens,
-                    ":output": output_tokens,
-                    ":cached": cached_tokens,
-                    ":cw5m": cache_write_5m_tokens,
-                    ":cw1h": cache_write_1h_tokens,
-                    ":requests": requests,
-                    ":cost": Decimal(str(cost)),
-                    ":updated": int(time.time()),
-                },
+            self._add_stats(
+                api_key,
+                input_tokens,
+                output_tokens,
+                cached_tokens,
+                cache_write_5m_tokens,
+                cache_write_1h_tokens,
+                requests,
+                cost,
             )
             return True
         except Exception as e:
             print(f"[UsageStatsManager] Error updating stats: {e}")
             return False
 
+    def _add_stats(
+        self,
+        api_key: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int,
+        cache_write_5m_tokens: int,
+        cache_write_1h_tokens: int,
+        requests: int,
+        cost: Union[Decimal, float],
+        last_aggregated_timestamp: Optional[int] = None,
+        expected_last_aggregated: Optional[int] = None,
+    ) -> bool:
+        """Atomically ADD counters to a key's stats item with the low-level client.
+
+        Values are marshalled directly ({"N": ...}) rather than through the
+        resource layer's TypeSerializer; float costs are formatted with fixed
+        precision instead of a Decimal(str(...)) round trip.
+
+        With expected_last_aggregated the update only applies if the stored
+        watermark still has that value, so a range is counted once even when
+        two aggregators race; returns False when it was not applied.
+        """
+        update_expression = (
+            "ADD #input :input, #output :output, #cached :cached, "
+            "#cw5m :cw5m, #cw1h :cw1h, #requests :requests, #cost :cost "
+            "SET #updated = :updated"
+        )
+        names = dict(_STATS_ATTRIBUTE_NAMES)
+        values = {
+            ":input": {"N": str(input_tokens)},
+            ":output": {"N": str(output_tokens)},
+            ":cached": {"N": str(cached_tokens)},
+            ":cw5m": {"N": str(cache_write_5m_tokens)},
+            ":cw1h": {"N": str(cache_write_1h_tokens)},
+            ":requests": {"N": str(requests)},
+            ":cost": {"N": format(cost, ".10f") if isinstance(cost, float) else str(cost)},
+            ":updated": {"N": str(time.time_ns() // 1_000_000_000)},
+        }
+        if last_aggregated_timestamp is not None:
+            update_expression += ", #last_ts = :last_ts"
+            names["#last_ts"] = "last_aggregated_timestamp"
+            values[":last_ts"] = {"N": str(last_aggregated_timestamp)}
+
+        condition = {}
+        if expected_last_aggregated is not None:
+            names["#last_ts"] = "last_aggregated_timestamp"
+            values[":expected"] = {"N": str(expected_last_aggregated)}
+            condition["ConditionExpression"] = (
+                "#last_ts = :expected"
+                if expected_last_aggregated > 0
+                else "attribute_not_exists(#last_ts) OR #last_ts = :expected"
+            )
+
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={"api_key": {"S": api_key}},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                **condition,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
     def aggregate_all_usage(
         self,
         api_keys: List[str],
         pricing_manager: Optional["ModelPricingManager"] = None,
         api_key_manager: Optional["APIKeyManager"] = None,
+        rollup_manager: Optional["UsageRollupManager"] = None,
+        max_workers: int = 16,
     ) -> int:
         """
         Aggregate usage from the usage table into usage_stats for all given API keys.
-        Also updates budget_used on the API key if pricing is available.
+        Also updates budget_used on the API key if pricing is available, and
+        folds the new records into the key's and the ALL daily rollups if a
+        rollup manager is given.
+
+        Keys are independent, so they are aggregated concurrently by up to
+        max_workers threads sharing the pooled client.
 
         Returns the number of keys processed.
         """
-        usage_table_name = settings.dynamodb_usage_table
-        usage_table = self.resource.Table(usage_table_name)
-        count = 0
+        # One BatchGetItem per 100 keys for the aggregation watermarks,
+        # instead of a GetItem per key
+        unique_keys = list(dict.fromkeys(api_keys))
+        try:
+            stats_by_key: Optional[Dict[str, Dict[str, Any]]] = self.get_stats_batch(
+                unique_keys, projection="api_key, last_aggregated_timestamp, last_event_timestamp"
+            )
+        except Exception as e:
+            print(f"[UsageStatsManager] Error batch getting stats, reading per key: {e}")
+            stats_by_key = None
 
-        for api_key in api_keys:
+        def aggregate(api_key: str) -> bool:
             try:
-                # Get current stats to find last aggregation timestamp
-                current_stats = self.get_stats(api_key)
-                last_aggregated = int(current_stats.get("last_aggregated_timestamp", 0)) if current_stats else 0
-
-                # Query usage records after last aggregation
-                query_kwargs = {
-                    "KeyConditionExpression": Key("api_key").eq(api_key),
-                }
-                if last_aggregated > 0:
-                    query_kwargs["KeyConditionExpression"] = (
-                        Key("api_key").eq(api_key) & Key("timestamp").gt(last_aggregated)
-                    )
-
-                response = usage_table.query(**query_kwargs)
-                items = response.get("Items", [])
-
-                # Handle pagination
-                while "LastEvaluatedKey" in response:
-                    query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-                    response = usage_table.query(**query_kwargs)
-                    items.extend(response.get("Items", []))
-
-                if not items:
-                    count += 1
-                    continue
-
-                # Aggregate tokens
-                total_input = sum(int(i.get("prompt_tokens", 0)) for i in items)
-                total_output = sum(int(i.get("completion_tokens", 0)) for i in items)
-                total_cached = sum(int(i.get("cached_tokens", 0)) for i in items)
-                total_cache_write_5m = sum(
-                    int(i.get("cache_write_tokens", 0)) for i in items if (i.get("cache_write_ttl") or "5m") != "1h"
+                current_stats = (
+                    stats_by_key.get(api_key) if stats_by_key is not None else self.get_stats(api_key)
                 )
-                total_cache_write_1h = sum(
-                    int(i.get("cache_write_tokens", 0)) for i in items if i.get("cache_write_ttl") == "1h"
+                self._aggregate_one(
+                    api_key, current_stats, pricing_manager, api_key_manager, rollup_manager
                 )
-                total_requests = len(items)
+                return True
+            except Exception as e:
+                print(f"[UsageStatsManager] Error aggregating for {api_key}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(api_keys)))) as executor:
+            return sum(executor.map(aggregate, api_keys))
+
+    def _aggregate_one(
+        self,
+        api_key: str,
+        current_stats: Optional[Dict[str, Any]],
+        pricing_manager: Optional["ModelPricingManager"],
+        api_key_manager: Optional["APIKeyManager"],
+        rollup_manager: Optional["UsageRollupManager"],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Aggregate one key's new usage records; returns its per-day rollup deltas.
+
+        current_stats is the key's stats item (None if it has none yet); it
+        supplies the last aggregation timestamp.
+
+        Only records at least usage_settle_seconds old are read, and the
+        watermark moves to that cutoff rather than to the newest record seen:
+        a record stamped earlier but written later (queued, retried, or from
+        another task) still lands ahead of the watermark.
+        """
+        last_aggregated = int(current_stats.get("last_aggregated_timestamp", 0)) if current_stats else 0
+        settled_until = time.time_ns() // 1_000_000 - settings.usage_settle_seconds * 1000
+        if settled_until <= last_aggregated:
+            return {}
+
+        # Idle key: the writer's marker shows nothing newer than the last
+        # aggregation, so skip the usage Query. Keys without a marker (records
+        # written before it existed) are always queried.
+        last_event = current_stats.get("last_event_timestamp") if current_stats else None
+        if last_event is not None and last_aggregated > 0 and int(last_event) <= last_aggregated:
+            return {}
+
+        # Query usage records after last aggregation, one page at a time
+        # Millisecond integers: BETWEEN last + 1 AND cutoff is (last, cutoff]
+        key_condition = "api_key = :k AND #ts BETWEEN :from AND :until"
+        values = {
+            ":k": {"S": api_key},
+            ":from": {"N": str(last_aggregated + 1 if last_aggregated > 0 else 0)},
+            ":until": {"N": str(settled_until)},
+        }
+        pages = self.client.get_paginator("query").paginate(
+            TableName=settings.dynamodb_usage_table,
+            KeyConditionExpression=key_condition,
+            ProjectionExpression=_USAGE_AGGREGATE_PROJECTION,
+            ExpressionAttributeNames={"#ts": "timestamp"},
+            ExpressionAttributeValues=values,
+            PaginationConfig={"PageSize": 1000},
+        )
+
+        # One streaming pass over the records: totals, daily
+        # rollup deltas and, for pricing, token counts per model (priced once
+        # per model below). Only the current page is held in memory.
+        total_input = total_output = total_cached = 0
+        total_cache_write_5m = total_cache_write_1h = 0
+        total_requests = 0
+        model_tokens: Dict[str, List[int]] = {}
+        key_days: Dict[str, Dict[str, Any]] = {}
+        for page in pages:
+            items = [_unmarshal(raw) for raw in page.get("Items", [])]
+            if not items:
+                continue
+            total_requests += len(items)
+            if rollup_manager:
+                for day, delta in UsageRollupManager.fold_items(items).items():
+                    UsageRollupManager.merge_delta(key_days, day, delta)
+            for item in items:
+                get = item.get
+                prompt = int(get("prompt_tokens", 0))
+                completion = int(get("completion_tokens", 0))
+                cached = int(get("cached_tokens", 0))
+                cache_write = int(get("cache_write_tokens", 0))
+                write_1h = get("cache_write_ttl") == "1h"
+                total_input += prompt
+                total_output += completion
+                total_cached += cached
+                if write_1h:
+                    total_cache_write_1h += cache_write
+                else:
+                    total_cache_write_5m += cache_write
 
-                # Calculate cost if pricing manager is available
-                total_cost = Decimal("0")
                 if pricing_manager:
-                    for item in items:
-                        model = item.get("model", "")
-                        prices = pricing_manager.get_price_for_model(model)
-                        if prices:
-                            input_cost = Decimal(str(int(item.get("prompt_tokens", 0)))) * Decimal(str(prices["input_price"])) / Decimal("1000000")
-                            output_cost = Decimal(str(int(item.get("completion_tokens", 0)))) * Decimal(str(prices["output_price"])) / Decimal("1000000")
-                            cache_read_cost = Decimal(str(int(item.get("cached_tokens", 0)))) * Decimal(str(prices["cache_read_price"])) / Decimal("1000000")
-                            # Use TTL-specific write price from cacheDetails
-                            write_ttl = item.get("cache_write_ttl", "5m") or "5m"
-                            if write_ttl == "1h":
-                                write_price = prices.get("cache_write_1h_price", 0)
-                            else:
-                                write_price = prices.get("cache_write_5m_price", 0)
-                            cache_write_cost = Decimal(str(int(item.get("cache_write_tokens", 0)))) * Decimal(str(write_price)) / Decimal("1000000")
-                            total_cost += input_cost + output_cost + cache_read_cost + cache_write_cost
-
-                # Find max timestamp for last_aggregated_timestamp
-                max_timestamp = max(int(i.get("timestamp", 0)) for i in items)
-
-                # Update aggregated stats
-                self.table.update_item(
-                    Key={"api_key": api_key},
-                    UpdateExpression=(
-                        "ADD #input :input, #output :output, #cached :cached, "
-                        "#cw5m :cw5m, #cw1h :cw1h, #requests :requests, #cost :cost "
-                        "SET #updated = :updated, #last_ts = :last_ts"
-                    ),
-                    ExpressionAttributeNames={
-                        "#input": "total_input_tokens",
-                        "#output": "total_output_tokens",
-                        "#cached": "total_cached_tokens",
-                        "#cw5m": "total_cache_write_5m_tokens",
-                        "#cw1h": "total_cache_write_1h_tokens",
-                        "#requests": "total_requests",
-                        "#cost": "total_cost",
-                        "#updated": "updated_at",
-                        "#last_ts": "last_aggregated_timestamp",
-                    },
-                    ExpressionAttributeValues={
-                        ":input": total_input,
-                        ":output": total_output,
-                        ":cached": total_cached,
-                        ":cw5m": total_cache_write_5m,
-                        ":cw1h": total_cache_write_1h,
-                        ":requests": total_requests,
-                        ":cost": total_cost,
-                        ":updated": int(time.time()),
-                        ":last_ts": max_timestamp,
-                    },
+                    model = get("model", "")
+                    tokens = model_tokens.get(model)
+                    if tokens is None:
+                        # prompt, completion, cache read, cache write 5m, cache write 1h
+                        tokens = model_tokens[model] = [0, 0, 0, 0, 0]
+                    tokens[0] += prompt
+                    tokens[1] += completion
+                    tokens[2] += cached
+                    tokens[4 if write_1h else 3] += cache_write
+
+        if not total_requests:
+            return {}
+
+        # Calculate cost if pricing manager is available; integer math per
+        # model, one Decimal division per key
+        total_cost = Decimal("0")
+        if pricing_manager:
+            cost_units = 0
+            model_prices = pricing_manager.get_prices_for_models(model_tokens)
+            for model, (prompt, completion, cached, write_5m, write_1h) in model_tokens.items():
+                prices = model_prices.get(model)
+                if prices:
+                    # TTL-specific cache write prices
+                    cost_units += (
+                        prompt * _price_units(prices["input_price"])
+                        + completion * _price_units(prices["output_price"])
+                        + cached * _price_units(prices["cache_read_price"])
+                        + write_5m * _price_units(prices.get("cache_write_5m_price", 0))
+                        + write_1h * _price_units(prices.get("cache_write_1h_price", 0))
+                    )
+            if cost_units:
+                total_cost = Decimal(cost_units) / _COST_DIVISOR
+
+        # Update aggregated stats. The watermark condition makes this the
+        # commit point: if another run already took the range, stop here so
+        # rollups and budget are not charged twice.
+        committed = self._add_stats(
+            api_key,
+            total_input,
+            total_output,
+            total_cached,
+            total_cache_write_5m,
+            total_cache_write_1h,
+            total_requests,
+            total_cost,
+            last_aggregated_timestamp=settled_until,
+            expected_last_aggregated=last_aggregated,
+        )
+        if not committed:
+            return {}
+
+        # Only now that the stats hold the range, fold it into the rollups.
+        # The key's rollups carry their own watermark, so replaying a range
+        # is a no-op; ALL is written in the same step (not at the end of the
+        # run), so a crash between keys loses nothing that was committed.
+        if rollup_manager:
+            for day, delta in key_days.items():
+                rollup_manager.add_usage(
+                    api_key, day, delta, since=last_aggregated, until=settled_until
                 )
+                rollup_manager.add_usage(UsageRollupManager.ALL_SCOPE, day, delta)
 
-                # Update budget_used on the API key
-                if api_key_manager and total_cost > 0:
-                    current_month = datetime.now(timezone.utc).strftime("%Y-%m")
-                    key_info = api_key_manager.get_api_key(api_key)
-                    if key_info:
-                        old_budget_used = Decimal(str(key_info.get("budget_used", 0) or 0))
-                        new_budget_used = old_budget_used + total_cost
-
-                        # Handle MTD budget
-                        old_mtd_month = key_info.get("budget_mtd_month", "")
-                        if old_mtd_month == current_month:
-                            old_mtd = Decimal(str(key_info.get("budget_used_mtd", 0) or 0))
-                            new_mtd = old_mtd + total_cost
-                        else:
-                            new_mtd = total_cost
-
-                        api_key_manager.table.update_item(
-                            Key={"api_key": api_key},
-                            UpdateExpression="SET #bu = :bu, #mtd = :mtd, #mm = :mm",
-                            ExpressionAttributeNames={
-                                "#bu": "budget_used",
-                                "#mtd": "budget_used_mtd",
-                                "#mm": "budget_mtd_month",
-                            },
-                            ExpressionAttributeValues={
-                                ":bu": new_budget_used,
-                                ":mtd": new_mtd,
-                                ":mm": current_month,
-                            },
-                        )
+        # Charge the cost to the key's budget (server-side increments)
+        if api_key_manager and total_cost > 0:
+            current_month = _current_month()
+            key_info = api_key_manager.add_budget_usage(api_key, total_cost, current_month)
+            if key_info:
+                # Check if budget exceeded
+                monthly_budget = Decimal(str(key_info.get("monthly_budget", 0) or 0))
+                new_mtd = Decimal(str(key_info.get("budget_used_mtd", 0) or 0))
+                if monthly_budget > 0 and new_mtd >= monthly_budget and key_info.get("is_active", False):
+                    api_key_manager.deactivate_for_budget_exceeded(api_key)
 
-                        # Check if budget exceeded
-                        monthly_budget = Decimal(str(key_info.get("monthly_budget", 0) or 0))
-                        if monthly_budget > 0 and new_mtd >= monthly_budget and key_info.get("is_active", False):
-                            api_key_manager.deactivate_for_budget_exceeded(api_key)
+        return key_days
 
-                count += 1
-            except Exception as e:
-                print(f"[UsageStatsManager] Error aggregating for {api_key}: {e}")
+    _serialize_item = staticmethod(_serialize_item)
 
-        return count
 
-    def _serialize_item(self, item: Dict) -> Dict[str, Any]:
-        """Convert DynamoDB item to plain dict."""
-        result = {}
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                if value == int(value):
-                    result[key] = int(value)
-                else:
-                    result[key] = float(value)
-            else:
-                result[key] = value
+class UsageRollupManager:
+    """Manage precomputed daily usage rollups in DynamoDB.
+
+    Rollups are keyed by (scope, day) where scope is an API key or "ALL".
+    They are written incrementally by the usage aggregator so time-window
+    reads are point lookups instead of re-reading raw usage records.
+    """
+
+    ALL_SCOPE = "ALL"
+
+    def __init__(self, dynamodb_client: DynamoDBClient):
+        self.client = dynamodb_client.client
+        self.resource = dynamodb_client.resource
+        self.table_name = settings.dynamodb_usage_rollups_table
+        self.table = dynamodb_client.table(self.table_name)
+
+    @staticmethod
+    def fold_items(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Fold raw usage records into per-day deltas."""
+        agg = defaultdict(int)
+        models = defaultdict(set)
+        # Records of the same UTC day share one strftime call
+        day_names: Dict[int, str] = {}
+        for item in items:
+            day = item.get("day_bucket")
+            if not day:
+                day_index = int(item.get("timestamp", 0)) // 86_400_000
+                day = day_names.get(day_index)
+                if day is None:
+                    day = day_names[day_index] = datetime.fromtimestamp(
+                        day_index * 86_400, tz=timezone.utc
+                    ).strftime("%Y-%m-%d")
+            agg[(day, "requests")] += 1
+            agg[(day, "prompt_tokens")] += int(item.get("prompt_tokens", 0))
+            agg[(day, "completion_tokens")] += int(item.get("completion_tokens", 0))
+            day_models = models[day]
+            if item.get("model"):
+                day_models.add(item["model"])
+
+        return {
+            day: {
+                "requests": agg[(day, "requests")],
+                "prompt_tokens": agg[(day, "prompt_tokens")],
+                "completion_tokens": agg[(day, "completion_tokens")],
+                "models": day_models,
+            }
+            for day, day_models in models.items()
+        }
+
+    @staticmethod
+    def merge_delta(target: Dict[str, Dict[str, Any]], day: str, delta: Dict[str, Any]) -> None:
+        """Merge one day's delta into an accumulator of per-day deltas."""
+        existing = target.get(day)
+        if existing is None:
+            target[day] = {**delta, "models": set(delta["models"])}
+            return
+        existing["requests"] += delta["requests"]
+        existing["prompt_tokens"] += delta["prompt_tokens"]
+        existing["completion_tokens"] += delta["completion_tokens"]
+        existing["models"] |= delta["models"]
+
+    def add_usage(
+        self,
+        scope: str,
+        day: str,
+        delta: Dict[str, Any],
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> bool:
+        """Atomically add a per-day delta to a rollup item.
+
+        When the delta covers the usage range (since, until], the item keeps
+        until as its watermark and the delta is only added if the watermark
+        is not past since, so a range already folded in is skipped.
+        """
+        update_expression = (
+            "ADD #requests :requests, #prompt :prompt, #completion :completion"
+        )
+        values = {
+            ":requests": delta["requests"],
+            ":prompt": delta["prompt_tokens"],
+            ":completion": delta["completion_tokens"],
+            ":updated": time.time_ns() // 1_000_000_000,
+        }
+        names = {
+            "#requests": "requests",
+            "#prompt": "prompt_tokens",
+            "#completion": "completion_tokens",
+            "#updated": "updated_at",
+        }
+        if delta["models"]:
+            update_expression += ", #models :models"
+            values[":models"] = set(delta["models"])
+            names["#models"] = "models"
+
+        set_expression = " SET #updated = :updated"
+        condition = {}
+        if until is not None:
+            set_expression += ", #watermark = :until"
+            names["#watermark"] = "source_watermark"
+            values[":until"] = until
+            values[":since"] = since or 0
+            condition["ConditionExpression"] = (
+                "attribute_not_exists(#watermark) OR #watermark <= :since"
+            )
+
+        try:
+            self.table.update_item(
+                Key={"scope": scope, "day": day},
+                UpdateExpression=update_expression + set_expression,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                **condition,
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                # This range is already in the rollup
+                return True
+            print(f"[UsageRollupManager] Error updating rollup {scope}/{day}: {e}")
+            return False
+        except Exception as e:
+            print(f"[UsageRollupManager] Error updating rollup {scope}/{day}: {e}")
+            return False
+
+    def get_days(self, scope: str, days: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch-get the rollups of the given days, keyed by day."""
+        result: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(days), 100):
+            request = {
+                self.table_name: {
+                    "Keys": [{"scope": scope, "day": day} for day in days[start:start + 100]],
+                }
+            }
+            attempt = 0
+            while request:
+                if attempt:
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+                response = self.resource.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    result[item["day"]] = item
+                request = response.get("UnprocessedKeys") or None
+                attempt += 1
         return result
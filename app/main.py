@@ -1,33 +1,86 @@
 """FastAPI application entry point."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api import chat, models, health
+from app.core.clock import run_clock
 from app.core.config import settings
 from app.core.exceptions import OpenAIProxyError
-from app.db.dynamodb import DynamoDBClient, ModelPricingManager
+from app.converters.openai_to_bedrock import close_http_client
+from app.db.dynamodb import ModelPricingManager, get_dynamodb_client
+from app.middleware.rate_limit import rate_limiter
+from app.services.bedrock_service import BedrockService
+from app.services.firehose_sink import FirehoseUsageSink
+from app.services.usage_writer import UsageWriter
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    # asyncio.to_thread offloads are DynamoDB calls (auth lookups, mapping
+    # loads, usage flushes); size their pool to the DynamoDB connection pool.
+    # Bedrock streams run on their own executor (see bedrock_service).
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.dynamodb_pool_size, thread_name_prefix="dynamodb")
+    )
+    app.state.usage_writer = None
     try:
-        app.state.dynamodb_client = DynamoDBClient()
+        app.state.dynamodb_client = get_dynamodb_client()
+        # Open pooled connections before the first request needs them
+        await asyncio.to_thread(app.state.dynamodb_client.warmup)
         # Seed default pricing if table is empty
         pricing_manager = ModelPricingManager(app.state.dynamodb_client)
         pricing_manager.seed_default_pricing()
+        # Usage records are queued by requests and written in batches
+        usage_sink = None
+        if settings.usage_sink == "firehose":
+            if settings.usage_firehose_stream:
+                usage_sink = FirehoseUsageSink(settings.usage_firehose_stream)
+                # Budget enforcement, rollups and the dashboard all read the
+                # DynamoDB usage table, which this sink never writes
+                print(
+                    "WARNING: USAGE_SINK=firehose - usage is NOT written to the DynamoDB "
+                    "usage table. Budget aggregation and budget-exceeded deactivation, "
+                    "usage rollups and the admin dashboard will not see any new usage."
+                )
+            else:
+                print("Warning: USAGE_SINK=firehose without USAGE_FIREHOSE_STREAM, using DynamoDB")
+        app.state.usage_writer = UsageWriter(
+            app.state.dynamodb_client,
+            max_queue_size=settings.usage_queue_max_size,
+            flush_interval=settings.usage_flush_interval_ms / 1000,
+            sink=usage_sink,
+        )
+        app.state.usage_writer.start()
     except Exception as e:
         print(f"Warning: Could not initialize DynamoDB client: {e}")
         app.state.dynamodb_client = None
 
+    # Shared Bedrock service (boto3 clients are thread-safe and costly to build)
+    app.state.bedrock_service = BedrockService(app.state.dynamodb_client)
+
+    # One maintainer task keeps the rate limiter's bucket map bounded
+    eviction_task = None
+    if settings.rate_limit_enabled:
+        eviction_task = asyncio.create_task(rate_limiter.run_eviction())
+    # Response "created" timestamps read a clock refreshed in the background
+    clock_task = asyncio.create_task(run_clock())
+
     yield
 
-    # Shutdown
-    pass
+    clock_task.cancel()
+    if eviction_task:
+        eviction_task.cancel()
+    # Shutdown: flush queued usage records
+    if app.state.usage_writer:
+        await app.state.usage_writer.stop()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -36,6 +89,7 @@ app = FastAPI(
     description="OpenAI-compatible API proxy for AWS Bedrock Claude models",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -52,7 +106,7 @@ app.add_middleware(
 # Exception handlers
 @app.exception_handler(OpenAIProxyError)
 async def openai_proxy_error_handler(request: Request, exc: OpenAIProxyError):
-    return JSONResponse(status_code=exc.http_status, content=exc.to_dict())
+    return ORJSONResponse(status_code=exc.http_status, content=exc.to_dict())
 
 
 # Include routers
@@ -1,12 +1,20 @@
 """Authentication middleware."""
+import asyncio
+import hmac
 import re
 from typing import Optional
 
+from botocore.exceptions import ClientError
 from fastapi import Depends, Header, HTTPException, Request, status
 
 from app.core.config import settings
 from app.core.exceptions import AuthenticationError
-from app.db.dynamodb import APIKeyManager
+from app.db.dynamodb import APIKeyManager, ModelMappingManager
+
+_NOT_CACHED = object()
+
+_BEARER_RE = re.compile(r"Bearer\s+(.+)", re.IGNORECASE)
+_BEARER_PREFIX_LEN = len("Bearer ")
 
 
 def extract_api_key(
@@ -16,7 +24,14 @@ def extract_api_key(
     """Extract API key from headers."""
     # Try Authorization: Bearer <key>
     if authorization:
-        match = re.match(r"Bearer\s+(.+)", authorization, re.IGNORECASE)
+        # Common case "Bearer <key>" without the regex engine
+        if (
+            len(authorization) > _BEARER_PREFIX_LEN
+            and authorization[:_BEARER_PREFIX_LEN].lower() == "bearer "
+            and not authorization[_BEARER_PREFIX_LEN].isspace()
+        ):
+            return authorization[_BEARER_PREFIX_LEN:]
+        match = _BEARER_RE.match(authorization)
         if match:
             return match.group(1)
 
@@ -48,15 +63,42 @@ async def get_api_key_info(
             },
         )
 
-    # Check master key
-    if settings.master_api_key and api_key == settings.master_api_key:
+    # Check master key (constant time; bytes so non-ASCII keys can't raise)
+    if settings.master_api_key and hmac.compare_digest(
+        api_key.encode(), settings.master_api_key.encode()
+    ):
         return {"api_key": api_key, "user_id": "master", "rate_limit": 10000, "cache_ttl": ""}
 
     # Validate against DynamoDB
     dynamodb_client = getattr(request.app.state, "dynamodb_client", None)
     if dynamodb_client:
-        api_key_manager = APIKeyManager(dynamodb_client)
-        key_info = api_key_manager.validate_api_key(api_key)
+        key_info = APIKeyManager.get_cached_validation(api_key, _NOT_CACHED)
+        if key_info is _NOT_CACHED:
+            # Cache miss: GetItem in a worker thread (coalesced per key)
+            api_key_manager = APIKeyManager(dynamodb_client)
+            validation = asyncio.to_thread(api_key_manager.validate_api_key, api_key)
+            try:
+                if ModelMappingManager.snapshot_is_fresh():
+                    key_info = await validation
+                else:
+                    # Reload the model mappings the request will need in parallel
+                    mapping_manager = ModelMappingManager(dynamodb_client)
+                    key_info, _ = await asyncio.gather(
+                        validation, asyncio.to_thread(mapping_manager.load_snapshot)
+                    )
+            except ClientError:
+                # DynamoDB throttled the lookup; the key may well be valid
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail={
+                        "error": {
+                            "message": "API key validation is temporarily unavailable, please retry.",
+                            "type": "server_error",
+                            "code": "service_unavailable",
+                        }
+                    },
+                    headers={"Retry-After": "1"},
+                )
         if key_info:
             return key_info
 
@@ -1,42 +1,57 @@
 """Rate limiting middleware using token bucket algorithm."""
+import asyncio
 import time
-from collections import defaultdict
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from fastapi import HTTPException, Request, status
 
 from app.core.config import settings
 
+# 429 body shared by every rejection (never mutated)
+_RATE_LIMIT_DETAIL = {
+    "error": {
+        "message": "Rate limit exceeded. Please retry after some time.",
+        "type": "rate_limit_error",
+        "code": "rate_limit_exceeded",
+    }
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class TokenBucket:
-    """Token bucket for rate limiting."""
+    """Token bucket for rate limiting.
 
-    capacity: int
-    tokens: float = field(default=0.0)
-    last_update: float = field(default_factory=time.time)
-    refill_rate: float = field(default=0.0)  # tokens per second
+    Slotted, and built fully formed by RateLimiter (no __post_init__):
+    there is one bucket per active API key.
+    """
 
-    def __post_init__(self):
-        self.tokens = float(self.capacity)
-        self.refill_rate = self.capacity / settings.rate_limit_window
+    capacity: int
+    tokens: float
+    refill_rate: float  # tokens per second
+    # X-RateLimit-Limit value; capacity never changes after creation
+    limit_header: str
+    # Monotonic, in integer nanoseconds: immune to wall-clock (NTP) steps
+    last_update_ns: int = field(default_factory=time.monotonic_ns)
+    # Guards only this bucket's refill-and-take, never the limiter's map
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
 
     def consume(self, tokens: int = 1) -> bool:
         """Try to consume tokens. Returns True if successful."""
-        now = time.time()
-        elapsed = now - self.last_update
-        self.last_update = now
+        with self._lock:
+            now = time.monotonic_ns()
+            elapsed_ns = now - self.last_update_ns
+            self.last_update_ns = now
 
-        # Refill tokens
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            # Refill tokens
+            self.tokens = min(self.capacity, self.tokens + elapsed_ns * self.refill_rate / 1e9)
 
-        # Try to consume
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
+            # Try to consume
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
 
     def get_remaining(self) -> int:
         return int(self.tokens)
@@ -50,42 +65,78 @@ class TokenBucket:
 
 
 class RateLimiter:
-    """Rate limiter using token bucket per API key."""
+    """Rate limiter using token bucket per API key.
+
+    Buckets are spread over independently locked shards by key hash, so
+    requests for different keys rarely wait on the same lock.
+    """
+
+    # Power of two, so the shard index is a mask rather than a modulo
+    SHARDS = 64
 
     def __init__(self):
-        self._buckets: Dict[str, TokenBucket] = defaultdict(
-            lambda: TokenBucket(capacity=settings.rate_limit_requests)
-        )
-        self._lock = Lock()
+        self._shards: List[Tuple[Dict[str, TokenBucket], Lock]] = [
+            ({}, Lock()) for _ in range(self.SHARDS)
+        ]
+        # Settings are fixed after startup; read once, not per new bucket
+        self._default_capacity = settings.rate_limit_requests
+        self._window = settings.rate_limit_window
 
     def check_rate_limit(self, api_key: str, rate_limit: int = None) -> TokenBucket:
         """Check and consume rate limit for API key."""
-        with self._lock:
-            if api_key not in self._buckets:
-                capacity = rate_limit or settings.rate_limit_requests
-                self._buckets[api_key] = TokenBucket(capacity=capacity)
-
-            bucket = self._buckets[api_key]
-
-            if not bucket.consume():
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "error": {
-                            "message": "Rate limit exceeded. Please retry after some time.",
-                            "type": "rate_limit_error",
-                            "code": "rate_limit_exceeded",
-                        }
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(bucket.capacity),
-                        "X-RateLimit-Remaining": str(bucket.get_remaining()),
-                        "X-RateLimit-Reset": str(bucket.get_reset_time()),
-                        "Retry-After": str(bucket.get_reset_time()),
-                    },
-                )
-
-            return bucket
+        buckets, lock = self._shards[hash(api_key) & (self.SHARDS - 1)]
+        bucket = buckets.get(api_key)
+        if bucket is None:
+            with lock:
+                bucket = buckets.get(api_key)
+                if bucket is None:
+                    capacity = rate_limit or self._default_capacity
+                    bucket = buckets[api_key] = TokenBucket(
+                        capacity=capacity,
+                        tokens=float(capacity),
+                        refill_rate=capacity / self._window,
+                        limit_header=str(capacity),
+                    )
+
+        # The shard lock is only taken to create a bucket; consuming holds
+        # just the bucket's own lock
+        if not bucket.consume():
+            reset = str(bucket.get_reset_time())
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=_RATE_LIMIT_DETAIL,
+                headers={
+                    "X-RateLimit-Limit": bucket.limit_header,
+                    "X-RateLimit-Remaining": str(bucket.get_remaining()),
+                    "X-RateLimit-Reset": reset,
+                    "Retry-After": reset,
+                },
+            )
+
+        return bucket
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Drop buckets unused for max_idle seconds; returns how many.
+
+        A bucket idle for a full window has refilled to capacity, so
+        dropping it is indistinguishable from keeping it. Shards are swept
+        one at a time, so callers only ever wait on a single shard.
+        """
+        cutoff = time.monotonic_ns() - int(max_idle * 1_000_000_000)
+        evicted = 0
+        for buckets, lock in self._shards:
+            with lock:
+                idle = [key for key, bucket in buckets.items() if bucket.last_update_ns < cutoff]
+                for key in idle:
+                    del buckets[key]
+            evicted += len(idle)
+        return evicted
+
+    async def run_eviction(self) -> None:
+        """Evict idle buckets once per window until cancelled (started in lifespan)."""
+        while True:
+            await asyncio.sleep(settings.rate_limit_window)
+            self.evict_idle(2 * settings.rate_limit_window)
 
 
 # Global rate limiter instance
@@ -105,7 +156,7 @@ async def check_rate_limit(request: Request):
 
     # Add rate limit headers to response
     request.state.rate_limit_headers = {
-        "X-RateLimit-Limit": str(bucket.capacity),
+        "X-RateLimit-Limit": bucket.limit_header,
         "X-RateLimit-Remaining": str(bucket.get_remaining()),
         "X-RateLimit-Reset": str(bucket.get_reset_time()),
     }
@@ -1,8 +1,9 @@
 """OpenAI API compatible schemas."""
-import time
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, TypedDict, Union
 from pydantic import BaseModel, Field
 
+from app.core.clock import now_seconds
+
 
 # Stream options
 class StreamOptions(BaseModel):
@@ -157,7 +158,7 @@ class Choice(BaseModel):
 class ChatCompletionResponse(BaseModel):
     id: str
     object: Literal["chat.completion"] = "chat.completion"
-    created: int = Field(default_factory=lambda: int(time.time()))
+    created: int = Field(default_factory=now_seconds)
     model: str
     choices: List[Choice]
     usage: Usage
@@ -179,17 +180,71 @@ class StreamChoice(BaseModel):
 class ChatCompletionChunk(BaseModel):
     id: str
     object: Literal["chat.completion.chunk"] = "chat.completion.chunk"
-    created: int = Field(default_factory=lambda: int(time.time()))
+    created: int = Field(default_factory=now_seconds)
     model: str
     choices: List[StreamChoice]
     usage: Optional[Usage] = None
 
 
+# Plain-dict shapes of the streaming models above. The stream path builds
+# these directly and encodes them with orjson, skipping model construction.
+class FunctionCallDict(TypedDict):
+    name: str
+    arguments: str
+
+
+class ToolCallDict(TypedDict):
+    index: int
+    id: str
+    type: Literal["function"]
+    function: FunctionCallDict
+
+
+class DeltaMessageDict(TypedDict):
+    role: Optional[Literal["assistant"]]
+    content: Optional[str]
+    tool_calls: Optional[List[ToolCallDict]]
+
+
+class StreamChoiceDict(TypedDict):
+    index: int
+    delta: DeltaMessageDict
+    finish_reason: Optional[Literal["stop", "length", "tool_calls", "content_filter"]]
+
+
+class PromptTokensDetailsDict(TypedDict):
+    cached_tokens: int
+
+
+class CacheCreationDict(TypedDict):
+    ephemeral_5m_input_tokens: int
+    ephemeral_1h_input_tokens: int
+
+
+class UsageDict(TypedDict):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    prompt_tokens_details: Optional[PromptTokensDetailsDict]
+    cache_creation_input_tokens: int
+    cache_read_input_tokens: int
+    cache_creation: Optional[CacheCreationDict]
+
+
+class ChatCompletionChunkDict(TypedDict):
+    id: str
+    object: Literal["chat.completion.chunk"]
+    created: int
+    model: str
+    choices: List[StreamChoiceDict]
+    usage: Optional[UsageDict]
+
+
 # Models API
 class Model(BaseModel):
     id: str
     object: Literal["model"] = "model"
-    created: int = Field(default_factory=lambda: int(time.time()))
+    created: int = Field(default_factory=now_seconds)
     owned_by: str = "anthropic"
     capabilities: Optional[Dict[str, Any]] = None
 
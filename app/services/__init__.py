@@ -1,4 +1,6 @@
 """Services module."""
 from app.services.bedrock_service import BedrockService
+from app.services.firehose_sink import FirehoseUsageSink
+from app.services.usage_writer import UsageWriter
 
-__all__ = ["BedrockService"]
+__all__ = ["BedrockService", "FirehoseUsageSink", "UsageWriter"]
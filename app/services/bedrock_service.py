@@ -1,43 +1,79 @@
 """Bedrock service for invoking Claude models."""
 import asyncio
-import json
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from typing import Any, AsyncGenerator, Dict, Optional
-from uuid import uuid4
 
 import boto3
+import orjson
 from botocore.config import Config
 
+from app.core.clock import now_seconds
 from app.core.config import settings
 from app.core.exceptions import BedrockAPIError
 from app.converters.openai_to_bedrock import OpenAIToBedrockConverter
-from app.converters.bedrock_to_openai import BedrockToOpenAIConverter
-from app.schemas.openai import ChatCompletionRequest, ChatCompletionResponse
+from app.converters.bedrock_to_openai import DONE_FRAME, BedrockToOpenAIConverter
+from app.schemas.openai import ChatCompletionRequest, ChatCompletionResponse, ModelList
 
+# Internal frame carrying stream usage to the caller; never sent to clients
+USAGE_MARKER = b"__usage__:"
 
-class BedrockService:
-    """Service for interacting with AWS Bedrock."""
+# SSE frames buffered between the Bedrock stream thread and the response
+STREAM_QUEUE_SIZE = 32
 
-    def __init__(self, dynamodb_client=None):
-        config = Config(
-            read_timeout=settings.bedrock_timeout,
-            connect_timeout=30,
-            retries={"max_attempts": 3, "mode": "adaptive"},
-        )
+# Stream producers block for as long as their client reads slowly, so they
+# get their own threads (one per pooled Bedrock connection) instead of the
+# loop's default executor, which serves the DynamoDB offloads
+STREAM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.bedrock_max_connections, thread_name_prefix="bedrock-stream"
+)
+
+
+@lru_cache(maxsize=1)
+def get_bedrock_client():
+    """The process-wide bedrock-runtime client.
+
+    boto3 clients are thread-safe and costly to build (endpoint resolution,
+    credentials, SSL), so every BedrockService shares this one and its
+    connection pool.
+    """
+    config = Config(
+        read_timeout=settings.bedrock_timeout,
+        connect_timeout=30,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        # botocore's default of 10 would make concurrent streams queue
+        max_pool_connections=settings.bedrock_max_connections,
+        tcp_keepalive=True,
+    )
 
-        client_kwargs = {
-            "service_name": "bedrock-runtime",
-            "region_name": settings.aws_region,
-            "config": config,
-        }
+    client_kwargs = {
+        "service_name": "bedrock-runtime",
+        "region_name": settings.aws_region,
+        "config": config,
+    }
 
-        if settings.aws_access_key_id and settings.aws_secret_access_key:
-            client_kwargs["aws_access_key_id"] = settings.aws_access_key_id
-            client_kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
+    if settings.aws_access_key_id and settings.aws_secret_access_key:
+        client_kwargs["aws_access_key_id"] = settings.aws_access_key_id
+        client_kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
+
+    if settings.bedrock_endpoint_url:
+        client_kwargs["endpoint_url"] = settings.bedrock_endpoint_url
+
+    # Own session: the boto3 default session is not thread-safe
+    return boto3.session.Session().client(**client_kwargs)
+
+
+class BedrockService:
+    """Service for interacting with AWS Bedrock.
 
-        if settings.bedrock_endpoint_url:
-            client_kwargs["endpoint_url"] = settings.bedrock_endpoint_url
+    One instance is shared by all requests (see app.main lifespan); anything
+    stateful per stream lives in per-call objects.
+    """
 
-        self.client = boto3.client(**client_kwargs)
+    def __init__(self, dynamodb_client=None):
+        self.client = get_bedrock_client()
         self.openai_to_bedrock = OpenAIToBedrockConverter(dynamodb_client)
         self.bedrock_to_openai = BedrockToOpenAIConverter()
 
@@ -53,10 +89,10 @@ class BedrockService:
             Tuple of (response, cache_usage) where cache_usage contains
             cached_tokens, cache_write_tokens, cache_write_ttl.
         """
-        request_id = request_id or f"chatcmpl-{uuid4().hex[:24]}"
+        request_id = request_id or f"chatcmpl-{secrets.token_hex(12)}"
 
         try:
-            bedrock_request = self.openai_to_bedrock.convert_request(request, cache_ttl=cache_ttl)
+            bedrock_request = await self.openai_to_bedrock.convert_request(request, cache_ttl=cache_ttl)
             model_id = bedrock_request.pop("modelId")
 
             response = self.client.converse(modelId=model_id, **bedrock_request)
@@ -82,86 +118,128 @@ class BedrockService:
         request: ChatCompletionRequest,
         request_id: Optional[str] = None,
         cache_ttl: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Handle streaming chat completion.
 
-        Yields SSE strings. If stream_options.include_usage is True,
+        Yields encoded SSE frames. If stream_options.include_usage is True,
         a final chunk with usage is emitted before [DONE].
-        The last yielded item may be a special "__usage__:..." line for internal tracking.
+        The last yielded item may be a USAGE_MARKER frame for internal tracking.
 
         Uses a thread pool for the synchronous boto3 stream iteration to avoid
         blocking the async event loop, enabling true incremental streaming.
         """
-        request_id = request_id or f"chatcmpl-{uuid4().hex[:24]}"
+        request_id = request_id or f"chatcmpl-{secrets.token_hex(12)}"
         include_usage = (
             request.stream_options
             and request.stream_options.include_usage
         )
 
         _SENTINEL = object()
-        queue: asyncio.Queue = asyncio.Queue()
+        # Bounded: a slow client makes the stream thread wait (backpressure)
+        # instead of buffering the whole generation in memory
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stop = threading.Event()
         loop = asyncio.get_running_loop()
+        # Stream conversion tracks tool-call state, so each stream gets its own
+        converter = BedrockToOpenAIConverter()
+        created = now_seconds()
+
+        # Conversion may download images, so it runs on the loop before the
+        # stream thread starts
+        try:
+            bedrock_request = await self.openai_to_bedrock.convert_request(request, cache_ttl=cache_ttl)
+        except Exception as e:
+            yield self._stream_error_frame(e)
+            yield DONE_FRAME
+            return
+        model_id = bedrock_request.pop("modelId")
+
+        def put(item) -> bool:
+            """Hand item to the consumer, waiting while the queue is full.
+
+            Returns False once the consumer has gone away.
+            """
+            if stop.is_set():
+                return False
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            return not stop.is_set()
 
         def _stream_in_thread():
+            stream = None
             try:
-                bedrock_request = self.openai_to_bedrock.convert_request(request, cache_ttl=cache_ttl)
-                model_id = bedrock_request.pop("modelId")
                 response = self.client.converse_stream(modelId=model_id, **bedrock_request)
+                stream = response.get("stream", [])
 
                 current_index = 0
                 usage_data = None
 
-                for event in response.get("stream", []):
-                    extracted = self.bedrock_to_openai.extract_stream_usage(event)
+                for event in stream:
+                    extracted = converter.extract_stream_usage(event)
                     if extracted:
                         usage_data = extracted
 
-                    sse_events = self.bedrock_to_openai.convert_stream_event(
-                        event, request.model, request_id, current_index
+                    sse_events = converter.convert_stream_event(
+                        event, request.model, request_id, current_index, created
                     )
                     for sse in sse_events:
-                        loop.call_soon_threadsafe(queue.put_nowait, sse)
+                        if not put(sse):
+                            return
 
                     if "contentBlockStart" in event:
                         current_index += 1
 
                 # Emit usage chunk if requested
                 if include_usage and usage_data:
-                    chunk = self.bedrock_to_openai.build_usage_chunk(
-                        request_id, request.model, usage_data, cache_ttl=cache_ttl
+                    chunk = converter.build_usage_chunk(
+                        request_id, request.model, usage_data, cache_ttl=cache_ttl,
+                        created=created,
                     )
-                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                    if not put(chunk):
+                        return
 
                 # Always emit [DONE]
-                loop.call_soon_threadsafe(queue.put_nowait, "data: [DONE]\n\n")
+                if not put(DONE_FRAME):
+                    return
 
                 # Emit internal usage marker
                 if usage_data:
-                    loop.call_soon_threadsafe(
-                        queue.put_nowait, f"__usage__:{json.dumps(usage_data)}"
-                    )
+                    put(USAGE_MARKER + orjson.dumps(usage_data))
 
             except Exception as e:
-                error_type = "server_error"
-                if "ValidationException" in type(e).__name__:
-                    error_type = "validation_error"
-                elif "ThrottlingException" in type(e).__name__:
-                    error_type = "rate_limit_error"
-                loop.call_soon_threadsafe(
-                    queue.put_nowait,
-                    f"data: {json.dumps({'error': {'message': str(e), 'type': error_type}})}\n\n"
-                )
-                loop.call_soon_threadsafe(queue.put_nowait, "data: [DONE]\n\n")
+                if put(self._stream_error_frame(e)):
+                    put(DONE_FRAME)
             finally:
-                loop.call_soon_threadsafe(queue.put_nowait, _SENTINEL)
+                if stop.is_set():
+                    # Client went away: release the Bedrock connection early
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+                put(_SENTINEL)
 
-        loop.run_in_executor(None, _stream_in_thread)
+        loop.run_in_executor(STREAM_EXECUTOR, _stream_in_thread)
 
-        while True:
-            item = await queue.get()
-            if item is _SENTINEL:
-                break
-            yield item
+        try:
+            while True:
+                item = await queue.get()
+                if item is _SENTINEL:
+                    break
+                yield item
+        finally:
+            # Stop the producer and unblock a put waiting on a full queue
+            stop.set()
+            while not queue.empty():
+                queue.get_nowait()
+
+    @staticmethod
+    def _stream_error_frame(e: Exception) -> bytes:
+        """Encode an exception as an SSE error frame."""
+        error_type = "server_error"
+        if "ValidationException" in type(e).__name__:
+            error_type = "validation_error"
+        elif "ThrottlingException" in type(e).__name__:
+            error_type = "rate_limit_error"
+        error = {"error": {"message": str(e), "type": error_type}}
+        return b"data: " + orjson.dumps(error) + b"\n\n"
 
     def list_models(self) -> list[Dict[str, Any]]:
         """List available models."""
@@ -181,3 +259,12 @@ class BedrockService:
                 },
             })
         return models
+
+    @cached_property
+    def models_json(self) -> bytes:
+        """The /v1/models response body, encoded once.
+
+        Built from settings that are fixed after startup, so every request
+        can be answered with the same bytes.
+        """
+        return orjson.dumps(ModelList(data=self.list_models()).model_dump())
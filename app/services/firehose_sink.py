@@ -0,0 +1,71 @@
+"""Optional usage sink that streams records to Kinesis Data Firehose."""
+import time
+from typing import List, Optional
+
+import boto3
+import orjson
+from botocore.config import Config
+
+from app.core.config import settings
+from app.db.dynamodb import UsageRecord
+
+
+class FirehoseUsageSink:
+    """Write usage records to a Firehose delivery stream with PutRecordBatch.
+
+    A drop-in replacement for UsageTracker.write_batch in UsageWriter, for
+    deployments that ship usage to S3 instead of paying a WCU per record.
+    Records are sent as newline-delimited JSON. The admin portal's usage
+    views and budget aggregation read the DynamoDB usage table, so they see
+    nothing written through this sink.
+    """
+
+    # PutRecordBatch accepts at most 500 records (and 4 MiB) per call
+    BATCH_SIZE = 500
+
+    def __init__(self, stream_name: str, client: Optional[object] = None):
+        self.stream_name = stream_name
+        self.client = client or self._create_client()
+
+    @staticmethod
+    def _create_client():
+        """Build the Firehose client with the same credentials as the other AWS clients."""
+        config = Config(
+            retries={"max_attempts": 3, "mode": "adaptive"},
+            max_pool_connections=settings.usage_firehose_pool_size,
+            tcp_keepalive=True,
+        )
+
+        client_kwargs = {
+            "service_name": "firehose",
+            "region_name": settings.aws_region,
+            "config": config,
+        }
+
+        if settings.aws_access_key_id and settings.aws_secret_access_key:
+            client_kwargs["aws_access_key_id"] = settings.aws_access_key_id
+            client_kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
+
+        # Own session: the boto3 default session is not thread-safe
+        return boto3.session.Session().client(**client_kwargs)
+
+    def write_batch(self, records: List[UsageRecord], max_attempts: int = 5) -> int:
+        """Send up to BATCH_SIZE records in one call, retrying failed entries.
+
+        Returns the number of records that could not be delivered.
+        """
+        entries = [{"Data": orjson.dumps(record) + b"\n"} for record in records]
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(min(0.05 * 2 ** attempt, 2.0))
+            response = self.client.put_record_batch(
+                DeliveryStreamName=self.stream_name, Records=entries
+            )
+            if not response.get("FailedPutCount"):
+                return 0
+            entries = [
+                entry
+                for entry, result in zip(entries, response["RequestResponses"])
+                if result.get("ErrorCode")
+            ]
+        return len(entries)
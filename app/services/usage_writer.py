@@ -0,0 +1,128 @@
+"""Background writer that persists queued usage records in batches."""
+import asyncio
+from typing import Any, List, Optional
+
+from app.db.dynamodb import DynamoDBClient, UsageRecord, UsageTracker
+
+
+class UsageWriter:
+    """Drain the usage queue into DynamoDB with BatchWriteItem.
+
+    Request handlers only enqueue records (see UsageTracker.record_usage), so
+    usage tracking adds no DynamoDB round trip to the request path. Another
+    sink (anything with BATCH_SIZE and write_batch, e.g. FirehoseUsageSink)
+    can take the place of the DynamoDB usage table.
+    """
+
+    def __init__(
+        self,
+        dynamodb_client: DynamoDBClient,
+        max_queue_size: int = 10000,
+        flush_interval: float = 0.2,
+        sink: Optional[Any] = None,
+        mark_interval: float = 1.0,
+    ):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.flush_interval = flush_interval
+        self.tracker = UsageTracker(dynamodb_client, queue=self.queue)
+        self.sink = sink or self.tracker
+        self.batch_size = self.sink.BATCH_SIZE
+        self.mark_interval = mark_interval
+        self._task: Optional[asyncio.Task] = None
+        self._mark_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background drain task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            if self.sink is self.tracker:
+                self._mark_task = asyncio.create_task(self._run_marks())
+
+    async def stop(self):
+        """Stop the drain task and flush whatever is still queued."""
+        for task in (self._task, self._mark_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._mark_task = None
+
+        remaining: List[UsageRecord] = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        if remaining:
+            # One worker-thread hop for the whole drain, not one per batch
+            await asyncio.to_thread(self._write_all, remaining)
+        if self.sink is self.tracker:
+            await asyncio.to_thread(self.tracker.flush_marks)
+
+    def _take_batch(self, batch: List[UsageRecord]) -> List[UsageRecord]:
+        """Top up batch with already-queued records, up to one BatchWriteItem."""
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _fill_batch(self, batch: List[UsageRecord]) -> List[UsageRecord]:
+        """Wait up to flush_interval for batch to reach BATCH_SIZE records."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        self._take_batch(batch)
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            self._take_batch(batch)
+        return batch
+
+    async def _flush(self, batch: List[UsageRecord]):
+        """Write one batch in a worker thread, logging (not raising) failures."""
+        if not batch:
+            return
+        try:
+            failed = await asyncio.to_thread(self.sink.write_batch, batch)
+            if failed:
+                print(f"[UsageWriter] Dropped {failed} usage records after retries")
+        except Exception as e:
+            print(f"[UsageWriter] Error writing usage batch: {e}")
+
+    def _write_all(self, records: List[UsageRecord]):
+        """Write records in BATCH_SIZE chunks from the calling (worker) thread."""
+        failed = 0
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            try:
+                failed += self.sink.write_batch(batch)
+            except Exception as e:
+                print(f"[UsageWriter] Error writing usage batch: {e}")
+                failed += len(batch)
+        if failed:
+            print(f"[UsageWriter] Dropped {failed} usage records after retries")
+
+    async def _run(self):
+        """Wait for records and write them in batches of up to BATCH_SIZE."""
+        while True:
+            first = await self.queue.get()
+            batch = [first]
+            try:
+                await self._fill_batch(batch)
+            finally:
+                # Records already taken off the queue must not be lost on stop()
+                await asyncio.shield(self._flush(batch))
+
+    async def _run_marks(self):
+        """Write the usage markers noted by write_batch once per mark_interval."""
+        while True:
+            await asyncio.sleep(self.mark_interval)
+            try:
+                await asyncio.to_thread(self.tracker.flush_marks)
+            except Exception as e:
+                print(f"[UsageWriter] Error marking usage: {e}")
@@ -49,6 +49,7 @@ const ecsStack = new ECSStack(app, `OpenAIProxy-ECS-${config.environmentName}`,
   modelMappingTable: dynamodbStack.modelMappingTable,
   pricingTable: dynamodbStack.pricingTable,
   usageStatsTable: dynamodbStack.usageStatsTable,
+  usageRollupsTable: dynamodbStack.usageRollupsTable,
   cognitoUserPoolId: cognitoStack?.userPool.userPoolId,
   cognitoClientId: cognitoStack?.userPoolClient.userPoolClientId,
 });
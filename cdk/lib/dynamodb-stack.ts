@@ -13,6 +13,7 @@ export class DynamoDBStack extends cdk.Stack {
   public readonly modelMappingTable: dynamodb.Table;
   public readonly pricingTable: dynamodb.Table;
   public readonly usageStatsTable: dynamodb.Table;
+  public readonly usageRollupsTable: dynamodb.Table;
 
   constructor(scope: Construct, id: string, props: DynamoDBStackProps) {
     super(scope, id, props);
@@ -37,6 +38,13 @@ export class DynamoDBStack extends cdk.Stack {
       partitionKey: { name: 'user_id', type: dynamodb.AttributeType.STRING },
     });
 
+    // Lists all API keys newest-first without a full-table scan
+    this.apiKeysTable.addGlobalSecondaryIndex({
+      indexName: 'EntityTypeIndex',
+      partitionKey: { name: 'entity_type', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'created_at', type: dynamodb.AttributeType.NUMBER },
+    });
+
     // Usage Table
     this.usageTable = new dynamodb.Table(this, 'UsageTable', {
       tableName: `openai-proxy-usage-${config.environmentName}`,
@@ -49,11 +57,24 @@ export class DynamoDBStack extends cdk.Stack {
       timeToLiveAttribute: 'ttl',
     });
 
+    // Unused, and due for removal. CloudFormation creates or deletes at most
+    // one GSI per table per update, so it stays until a deploy after
+    // DailyUsageIndex is ACTIVE (see scripts/migrate_drop_request_id_index.py).
     this.usageTable.addGlobalSecondaryIndex({
       indexName: 'request_id-index',
       partitionKey: { name: 'request_id', type: dynamodb.AttributeType.STRING },
     });
 
+    // Time-window reads (dashboard) query one UTC day bucket at a time
+    this.usageTable.addGlobalSecondaryIndex({
+      indexName: 'DailyUsageIndex',
+      partitionKey: { name: 'day_bucket', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'timestamp', type: dynamodb.AttributeType.NUMBER },
+      // The dashboard only reads model; don't copy whole records
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ['model'],
+    });
+
     // Model Mapping Table
     this.modelMappingTable = new dynamodb.Table(this, 'ModelMappingTable', {
       tableName: `openai-proxy-model-mapping-${config.environmentName}`,
@@ -84,6 +105,17 @@ export class DynamoDBStack extends cdk.Stack {
         : cdk.RemovalPolicy.DESTROY,
     });
 
+    // Usage Rollups Table (daily usage per API key and "ALL")
+    this.usageRollupsTable = new dynamodb.Table(this, 'UsageRollupsTable', {
+      tableName: `openai-proxy-usage-rollups-${config.environmentName}`,
+      partitionKey: { name: 'scope', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'day', type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: config.environmentName === 'prod'
+        ? cdk.RemovalPolicy.RETAIN
+        : cdk.RemovalPolicy.DESTROY,
+    });
+
     // Tags
     Object.entries(config.tags).forEach(([key, value]) => {
       cdk.Tags.of(this).add(key, value);
@@ -114,5 +146,10 @@ export class DynamoDBStack extends cdk.Stack {
       value: this.usageStatsTable.tableName,
       description: 'Usage Stats Table Name',
     });
+
+    new cdk.CfnOutput(this, 'UsageRollupsTableName', {
+      value: this.usageRollupsTable.tableName,
+      description: 'Usage Rollups Table Name',
+    });
   }
 }
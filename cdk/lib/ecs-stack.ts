@@ -21,6 +21,7 @@ export interface ECSStackProps extends cdk.StackProps {
   modelMappingTable: dynamodb.Table;
   pricingTable: dynamodb.Table;
   usageStatsTable: dynamodb.Table;
+  usageRollupsTable: dynamodb.Table;
   // Cognito (optional - for admin portal)
   cognitoUserPoolId?: string;
   cognitoClientId?: string;
@@ -36,7 +37,7 @@ export class ECSStack extends cdk.Stack {
 
     const { config, vpc, albSecurityGroup, ecsSecurityGroup } = props;
     const { apiKeysTable, usageTable, modelMappingTable } = props;
-    const { pricingTable, usageStatsTable } = props;
+    const { pricingTable, usageStatsTable, usageRollupsTable } = props;
     const { cognitoUserPoolId, cognitoClientId } = props;
 
     // ECS Cluster
@@ -105,6 +106,7 @@ export class ECSStack extends cdk.Stack {
     modelMappingTable.grantReadWriteData(taskRole);
     pricingTable.grantReadWriteData(taskRole);
     usageStatsTable.grantReadWriteData(taskRole);
+    usageRollupsTable.grantReadWriteData(taskRole);
 
     // Grant Bedrock permissions
     taskRole.addToPolicy(
@@ -240,7 +242,7 @@ export class ECSStack extends cdk.Stack {
       this.createAdminPortalService(
         config, vpc, ecsSecurityGroup, taskExecutionRole, taskRole,
         cpuArchitecture, dockerPlatform, apiKeysTable, usageTable, modelMappingTable,
-        pricingTable, usageStatsTable, cognitoUserPoolId, cognitoClientId
+        pricingTable, usageStatsTable, usageRollupsTable, cognitoUserPoolId, cognitoClientId
       );
     }
 
@@ -284,6 +286,7 @@ export class ECSStack extends cdk.Stack {
     modelMappingTable: dynamodb.Table,
     pricingTable: dynamodb.Table,
     usageStatsTable: dynamodb.Table,
+    usageRollupsTable: dynamodb.Table,
     cognitoUserPoolId?: string,
     cognitoClientId?: string,
   ): void {
@@ -327,6 +330,7 @@ export class ECSStack extends cdk.Stack {
         DYNAMODB_MODEL_MAPPING_TABLE: modelMappingTable.tableName,
         DYNAMODB_PRICING_TABLE: pricingTable.tableName,
         DYNAMODB_USAGE_STATS_TABLE: usageStatsTable.tableName,
+        DYNAMODB_USAGE_ROLLUPS_TABLE: usageRollupsTable.tableName,
         // Cognito (if configured)
         ...(cognitoUserPoolId && { COGNITO_USER_POOL_ID: cognitoUserPoolId }),
         ...(cognitoClientId && { COGNITO_CLIENT_ID: cognitoClientId }),
@@ -5,7 +5,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.dynamodb import DynamoDBClient, APIKeyManager
+from app.db.dynamodb import APIKeyManager, get_dynamodb_client
 
 
 def main():
@@ -15,7 +15,7 @@ def main():
     parser.add_argument("--rate-limit", type=int, default=100, help="Rate limit per minute")
     args = parser.parse_args()
 
-    client = DynamoDBClient()
+    client = get_dynamodb_client()
     manager = APIKeyManager(client)
 
     api_key = manager.create_api_key(
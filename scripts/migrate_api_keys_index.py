@@ -0,0 +1,114 @@
+"""Add the EntityTypeIndex GSI to the API keys table and backfill existing keys.
+
+Keys created before the index existed have no ``entity_type`` attribute and may
+carry ``created_at`` as an ISO string; both are normalized so every key shows
+up in the admin listing query.
+
+Usage:
+    # Local DynamoDB
+    python scripts/migrate_api_keys_index.py
+
+    # Production (uses IAM role)
+    AWS_REGION=us-west-2 python scripts/migrate_api_keys_index.py --no-endpoint --table openai-proxy-api-keys-prod
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import boto3
+
+ENTITY_TYPE = "api_key"
+INDEX_NAME = "EntityTypeIndex"
+
+
+def _to_epoch(value):
+    if isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+        except ValueError:
+            return int(time.time())
+    if value is None:
+        return int(time.time())
+    return int(value)
+
+
+def migrate(endpoint_url=None, table_name="openai-proxy-api-keys"):
+    region = os.environ.get("AWS_REGION", "us-west-2")
+
+    client_kwargs = {
+        "service_name": "dynamodb",
+        "region_name": region,
+    }
+    if endpoint_url:
+        client_kwargs["endpoint_url"] = endpoint_url
+        client_kwargs["aws_access_key_id"] = os.environ.get("AWS_ACCESS_KEY_ID", "local")
+        client_kwargs["aws_secret_access_key"] = os.environ.get("AWS_SECRET_ACCESS_KEY", "local")
+
+    client = boto3.client(**client_kwargs)
+    table = boto3.resource(**client_kwargs).Table(table_name)
+
+    description = client.describe_table(TableName=table_name)["Table"]
+    index_names = {i["IndexName"] for i in description.get("GlobalSecondaryIndexes", [])}
+    if INDEX_NAME in index_names:
+        print(f"  SKIP  {INDEX_NAME} (already exists)")
+    else:
+        client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=[
+                {"AttributeName": "entity_type", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexUpdates=[
+                {
+                    "Create": {
+                        "IndexName": INDEX_NAME,
+                        "KeySchema": [
+                            {"AttributeName": "entity_type", "KeyType": "HASH"},
+                            {"AttributeName": "created_at", "KeyType": "RANGE"},
+                        ],
+                        "Projection": {"ProjectionType": "ALL"},
+                    }
+                }
+            ],
+        )
+        print(f"  ADD   {INDEX_NAME}")
+
+    updated = 0
+    skipped = 0
+    scan_kwargs = {"ProjectionExpression": "api_key, entity_type, created_at"}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            created_at = item.get("created_at")
+            if item.get("entity_type") == ENTITY_TYPE and not isinstance(created_at, str):
+                skipped += 1
+                continue
+            table.update_item(
+                Key={"api_key": item["api_key"]},
+                UpdateExpression="SET entity_type = :et, created_at = :ca",
+                ExpressionAttributeValues={
+                    ":et": ENTITY_TYPE,
+                    ":ca": _to_epoch(created_at),
+                },
+            )
+            updated += 1
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"\nDone: {updated} keys backfilled, {skipped} already indexed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add EntityTypeIndex to the API keys table")
+    parser.add_argument("--no-endpoint", action="store_true", help="Don't use local endpoint")
+    parser.add_argument("--table", default="openai-proxy-api-keys", help="DynamoDB table name")
+    args = parser.parse_args()
+
+    endpoint = None if args.no_endpoint else os.environ.get("DYNAMODB_ENDPOINT_URL", "http://localhost:8001")
+
+    print(f"Migrating table: {args.table}")
+    if endpoint:
+        print(f"Endpoint: {endpoint}")
+    migrate(endpoint_url=endpoint, table_name=args.table)
@@ -0,0 +1,83 @@
+"""Drop the unused request_id-index GSI from the usage table.
+
+Nothing queries usage records by request_id, but every usage write was
+still replicated into the index, doubling the table's write cost. Records
+keep their ``request_id`` attribute; only the index goes away.
+
+Order matters: DynamoDB (and CloudFormation) create or delete only one GSI
+per table per update, so
+
+1. deploy DailyUsageIndex first (scripts/migrate_usage_day_bucket.py, or
+   the CDK stack, which still declares request_id-index);
+2. wait until DailyUsageIndex is ACTIVE (``aws dynamodb describe-table``);
+3. drop request_id-index, either with this script or by removing it from
+   cdk/lib/dynamodb-stack.ts in a separate deploy. If the script drops it
+   while the CDK stack still declares it, remove it from the stack before
+   the next deploy, or that deploy recreates it.
+
+The script refuses to run while another index on the table is still being
+created or deleted.
+
+Usage:
+    # Local DynamoDB
+    python scripts/migrate_drop_request_id_index.py
+
+    # Production (uses IAM role)
+    AWS_REGION=us-west-2 python scripts/migrate_drop_request_id_index.py --no-endpoint --table openai-proxy-usage-prod
+"""
+import argparse
+import os
+
+import boto3
+
+INDEX_NAME = "request_id-index"
+
+
+def migrate(endpoint_url=None, table_name="openai-proxy-usage"):
+    region = os.environ.get("AWS_REGION", "us-west-2")
+
+    client_kwargs = {
+        "service_name": "dynamodb",
+        "region_name": region,
+    }
+    if endpoint_url:
+        client_kwargs["endpoint_url"] = endpoint_url
+        client_kwargs["aws_access_key_id"] = os.environ.get("AWS_ACCESS_KEY_ID", "local")
+        client_kwargs["aws_secret_access_key"] = os.environ.get("AWS_SECRET_ACCESS_KEY", "local")
+
+    client = boto3.client(**client_kwargs)
+
+    description = client.describe_table(TableName=table_name)["Table"]
+    index_names = {i["IndexName"] for i in description.get("GlobalSecondaryIndexes", [])}
+    if INDEX_NAME not in index_names:
+        print(f"  SKIP  {INDEX_NAME} (not present)")
+        return
+
+    busy = [
+        i["IndexName"]
+        for i in description.get("GlobalSecondaryIndexes", [])
+        if i.get("IndexStatus") != "ACTIVE"
+    ]
+    if busy:
+        print(f"  WAIT  {', '.join(busy)} not ACTIVE yet; rerun once the index update finishes")
+        return
+
+    client.update_table(
+        TableName=table_name,
+        GlobalSecondaryIndexUpdates=[{"Delete": {"IndexName": INDEX_NAME}}],
+    )
+    print(f"  DROP  {INDEX_NAME}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drop request_id-index from the usage table")
+    parser.add_argument("--no-endpoint", action="store_true", help="Don't use local endpoint")
+    parser.add_argument("--table", default="openai-proxy-usage", help="DynamoDB table name")
+    args = parser.parse_args()
+
+    endpoint = None if args.no_endpoint else os.environ.get("DYNAMODB_ENDPOINT_URL", "http://localhost:8001")
+
+    print(f"Migrating table: {args.table}")
+    if endpoint:
+        print(f"Endpoint: {endpoint}")
+    migrate(endpoint_url=endpoint, table_name=args.table)
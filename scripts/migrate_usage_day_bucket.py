@@ -0,0 +1,110 @@
+"""Add the DailyUsageIndex GSI to the usage table and backfill day_bucket.
+
+Usage records written before the index existed have no ``day_bucket``
+attribute, so the dashboard's per-day queries cannot see them. This script
+creates the index if needed and tags records from the last ``--days`` days.
+
+Usage:
+    # Local DynamoDB
+    python scripts/migrate_usage_day_bucket.py
+
+    # Production (uses IAM role)
+    AWS_REGION=us-west-2 python scripts/migrate_usage_day_bucket.py --no-endpoint --table openai-proxy-usage-prod
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+INDEX_NAME = "DailyUsageIndex"
+
+
+def migrate(endpoint_url=None, table_name="openai-proxy-usage", days=30):
+    region = os.environ.get("AWS_REGION", "us-west-2")
+
+    client_kwargs = {
+        "service_name": "dynamodb",
+        "region_name": region,
+    }
+    if endpoint_url:
+        client_kwargs["endpoint_url"] = endpoint_url
+        client_kwargs["aws_access_key_id"] = os.environ.get("AWS_ACCESS_KEY_ID", "local")
+        client_kwargs["aws_secret_access_key"] = os.environ.get("AWS_SECRET_ACCESS_KEY", "local")
+
+    client = boto3.client(**client_kwargs)
+    table = boto3.resource(**client_kwargs).Table(table_name)
+
+    description = client.describe_table(TableName=table_name)["Table"]
+    index_names = {i["IndexName"] for i in description.get("GlobalSecondaryIndexes", [])}
+    if INDEX_NAME in index_names:
+        print(f"  SKIP  {INDEX_NAME} (already exists)")
+        projection = next(
+            i["Projection"] for i in description["GlobalSecondaryIndexes"] if i["IndexName"] == INDEX_NAME
+        )
+        if projection.get("ProjectionType") == "ALL":
+            # A GSI's projection can't be changed in place
+            print(f"  NOTE  {INDEX_NAME} projects ALL attributes; delete it and rerun to project only model")
+    else:
+        client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=[
+                {"AttributeName": "day_bucket", "AttributeType": "S"},
+                {"AttributeName": "timestamp", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexUpdates=[
+                {
+                    "Create": {
+                        "IndexName": INDEX_NAME,
+                        "KeySchema": [
+                            {"AttributeName": "day_bucket", "KeyType": "HASH"},
+                            {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                        ],
+                        "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["model"]},
+                    }
+                }
+            ],
+        )
+        print(f"  ADD   {INDEX_NAME}")
+
+    since_ms = int((time.time() - days * 86400) * 1000)
+    updated = 0
+    scan_kwargs = {
+        "ProjectionExpression": "api_key, #ts",
+        "ExpressionAttributeNames": {"#ts": "timestamp"},
+        "FilterExpression": Attr("timestamp").gte(since_ms) & Attr("day_bucket").not_exists(),
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            ts = int(item["timestamp"])
+            table.update_item(
+                Key={"api_key": item["api_key"], "timestamp": ts},
+                UpdateExpression="SET day_bucket = :d",
+                ExpressionAttributeValues={
+                    ":d": datetime.fromtimestamp(ts / 1000, tz=timezone.utc).strftime("%Y-%m-%d"),
+                },
+            )
+            updated += 1
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"\nDone: {updated} usage records backfilled")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add DailyUsageIndex to the usage table")
+    parser.add_argument("--no-endpoint", action="store_true", help="Don't use local endpoint")
+    parser.add_argument("--table", default="openai-proxy-usage", help="DynamoDB table name")
+    parser.add_argument("--days", type=int, default=30, help="Backfill records from the last N days")
+    args = parser.parse_args()
+
+    endpoint = None if args.no_endpoint else os.environ.get("DYNAMODB_ENDPOINT_URL", "http://localhost:8001")
+
+    print(f"Migrating table: {args.table}")
+    if endpoint:
+        print(f"Endpoint: {endpoint}")
+    migrate(endpoint_url=endpoint, table_name=args.table, days=args.days)
@@ -22,13 +22,23 @@ def create_tables():
             "AttributeDefinitions": [
                 {"AttributeName": "api_key", "AttributeType": "S"},
                 {"AttributeName": "user_id", "AttributeType": "S"},
+                {"AttributeName": "entity_type", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "N"},
             ],
             "GlobalSecondaryIndexes": [
                 {
                     "IndexName": "user_id-index",
                     "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
                     "Projection": {"ProjectionType": "ALL"},
-                }
+                },
+                {
+                    "IndexName": "EntityTypeIndex",
+                    "KeySchema": [
+                        {"AttributeName": "entity_type", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
             ],
             "BillingMode": "PAY_PER_REQUEST",
         },
@@ -41,14 +51,18 @@ def create_tables():
             "AttributeDefinitions": [
                 {"AttributeName": "api_key", "AttributeType": "S"},
                 {"AttributeName": "timestamp", "AttributeType": "N"},
-                {"AttributeName": "request_id", "AttributeType": "S"},
+                {"AttributeName": "day_bucket", "AttributeType": "S"},
             ],
             "GlobalSecondaryIndexes": [
                 {
-                    "IndexName": "request_id-index",
-                    "KeySchema": [{"AttributeName": "request_id", "KeyType": "HASH"}],
-                    "Projection": {"ProjectionType": "ALL"},
-                }
+                    "IndexName": "DailyUsageIndex",
+                    "KeySchema": [
+                        {"AttributeName": "day_bucket", "KeyType": "HASH"},
+                        {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                    ],
+                    # The dashboard only reads model; don't copy whole records
+                    "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["model"]},
+                },
             ],
             "BillingMode": "PAY_PER_REQUEST",
         },
@@ -76,6 +90,18 @@ def create_tables():
             ],
             "BillingMode": "PAY_PER_REQUEST",
         },
+        {
+            "TableName": "openai-proxy-usage-rollups",
+            "KeySchema": [
+                {"AttributeName": "scope", "KeyType": "HASH"},
+                {"AttributeName": "day", "KeyType": "RANGE"},
+            ],
+            "AttributeDefinitions": [
+                {"AttributeName": "scope", "AttributeType": "S"},
+                {"AttributeName": "day", "AttributeType": "S"},
+            ],
+            "BillingMode": "PAY_PER_REQUEST",
+        },
     ]
 
     for table_def in tables: